@@ -1,17 +1,18 @@
 from __future__ import annotations
 
-import json
 from typing import List
 
+import orjson
+
 from app.models.pantry import PantryItem
 from app.models.recipe import DietaryTag, Difficulty, RecipeMode
 
 
 recipe_prompt = """Role: Pantry recipe engine.
-Inputs: `items` [{{n:name, q:qty, s:"good"|"expiring"|"expired"}}], `prefs` [dietary filters], `max_time` (mins), `diff` (any|easy|medium|hard), `mode` (mine|household).
+Inputs: `items` rows laid out by `items_schema` [n:name, q:qty, s:"good"|"expiring_soon"|"expired"|"no_date"|null], `prefs` [dietary filters], `max_time` (mins), `diff` (any|easy|medium|hard), `mode` (mine|household).
 
 Rules:
-1. Output EXACTLY 3 recipes prioritizing "expiring"/"expired" items. Fallback: simple staple recipes.
+1. Output EXACTLY 3 recipes prioritizing "expiring_soon"/"expired" items. Fallback: simple staple recipes.
 2. Strictly obey `prefs`.
 3. Never invent owned items; flag missing ingredients via `have: false`.
 4. Output ONLY a raw JSON array. No markdown, no prose, no code fences.
@@ -32,6 +33,11 @@ Schema:
   "note": "str(household coordination note) or null"
 }]"""
 
+# Static prompt prefix, encoded once so each call only serializes the context.
+_PROMPT_PREFIX = f"{recipe_prompt}\n\nContext:\n".encode()
+# Column names for the positional item rows; shorter than repeating keys per item.
+_ITEMS_SCHEMA = ("n", "q", "s")
+
 def get_recipe_prompt(
     items: List[PantryItem],
     prefs: List[DietaryTag],
@@ -43,27 +49,20 @@ def get_recipe_prompt(
     Build the base recipe prompt plus a structured JSON context.
 
     The context encodes:
-    - pantry items (name, quantity, freshness/status)
+    - pantry items as positional (name, quantity, expiry status) rows, see `items_schema`
     - dietary preferences (DietaryTag values)
     - time and difficulty constraints
     - recipe mode (personal vs household)
     """
-    items_payload = [
-        {
-            "name": item.name,
-            "quantity": item.quantity,
-            "status": getattr(item, "status", None),
-        }
-        for item in items
-    ]
     context = {
-        "items": items_payload,
-        "prefs": [tag.value for tag in prefs],
+        "items_schema": _ITEMS_SCHEMA,
+        "items": [(item.name, item.quantity, item.expiry_status) for item in items],
+        "prefs": prefs,
         "max_time": max_time,
-        "diff": diff.value,
-        "mode": mode.value,
+        "diff": diff,
+        "mode": mode,
     }
-    return f"{recipe_prompt}\n\nContext:\n{json.dumps(context, ensure_ascii=False)}"
+    return (_PROMPT_PREFIX + orjson.dumps(context)).decode("utf-8")
 
 def get_recipe_prompt_with_specific_wants(
     items: List[PantryItem],
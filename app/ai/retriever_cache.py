@@ -1,15 +1,74 @@
 from __future__ import annotations
 
-import hashlib
+import asyncio
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
+import weakref
+from collections import OrderedDict, defaultdict
+from typing import Callable, DefaultDict, Dict, List, Optional, Sequence, Set, Tuple
 
+import anyio
+import numpy as np
+import xxhash
 from langchain_core.documents import Document
 
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+NS_PER_SECOND = 1_000_000_000
+
+# Minimum cosine similarity between query embeddings for a semantic cache hit.
+SEMANTIC_HIT_THRESHOLD = 0.95
+# Most recently used Document lists kept strongly referenced, so repeated queries
+# get their documents back even after every caller has dropped them.
+MAX_PINNED_DOCUMENTS = 256
+
+
+class _DocList(list):
+    """List of retrieved documents that can be weakly referenced (plain lists can't)."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _normalize(vector: Sequence[float]) -> Optional[np.ndarray]:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    if norm == 0.0:
+        return None
+    return array / norm
+
+
+class _QueryIndex:
+    """
+    Normalized query embeddings for one (household, k) pair, stacked lazily into a matrix.
+
+    Not thread-safe on its own; RetrieverCache only touches it under its lock.
+    """
+
+    def __init__(self) -> None:
+        self.vectors: Dict[bytes, np.ndarray] = {}
+        self._keys: List[bytes] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def add(self, key: bytes, vector: np.ndarray) -> None:
+        self.vectors[key] = vector
+        self._matrix = None
+
+    def discard(self, key: bytes) -> None:
+        if self.vectors.pop(key, None) is not None:
+            self._matrix = None
+
+    def best_match(self, query: np.ndarray) -> Tuple[Optional[bytes], float]:
+        if not self.vectors:
+            return None, 0.0
+        if self._matrix is None:
+            self._keys = list(self.vectors)
+            self._matrix = np.stack([self.vectors[key] for key in self._keys])
+        similarities = self._matrix @ query
+        best = int(np.argmax(similarities))
+        return self._keys[best], float(similarities[best])
+
 
 class RetrieverCache:
     """
@@ -17,21 +76,38 @@ class RetrieverCache:
 
     This is optimized for pantry RAG use-cases:
     - Keys include household id, query text, and top-k
+    - Serialized context strings are held strongly; Document lists are held strongly
+      for the `max_pinned` most recently used entries and weakly beyond that, so an
+      older hit whose documents were freed returns the string with an empty list
+    - Paraphrased queries can hit via query-embedding similarity (`get_similar`)
     - Cache is invalidated explicitly by pantry write operations
     - A TTL is kept as a secondary safety net
+    - Safe to use from several threads (warmup workers, retrieval search pool)
     """
 
-    def __init__(self, ttl_seconds: int = 300) -> None:
+    def __init__(self, ttl_seconds: int = 300, max_pinned: int = MAX_PINNED_DOCUMENTS) -> None:
         # ttl_seconds is a safety net — primary invalidation is content-based via service hooks
-        self._ttl = ttl_seconds
-        # { cache_key: (documents, serialized, fetched_at, household_id) }
-        self._store: Dict[str, Tuple[List[Document], str, float, str]] = {}
-        # { household_id: last_known_updated_at } (reserved for future state-based invalidation)
-        self._pantry_state: Dict[str, str] = {}
+        self._ttl_ns = int(ttl_seconds * NS_PER_SECOND)
+        # { cache_key: (serialized, expires_at_ns) } on the time.monotonic_ns() clock
+        self._serialized: Dict[bytes, Tuple[str, int]] = {}
+        # { cache_key: documents }, alive only while a caller still holds the list
+        self._documents: "weakref.WeakValueDictionary[bytes, _DocList]" = weakref.WeakValueDictionary()
+        # { cache_key: documents } in LRU order; keeps the hot lists alive
+        self._pinned: "OrderedDict[bytes, _DocList]" = OrderedDict()
+        self._max_pinned = max_pinned
+        # { household_id: {cache_key, ...} } so invalidation only touches that household's entries
+        self._by_hh: DefaultDict[str, Set[bytes]] = defaultdict(set)
+        # { household_id: { k: _QueryIndex } } for semantic lookups
+        self._semantic: Dict[str, Dict[int, _QueryIndex]] = {}
+        # { household_id: fingerprint of sorted (item_id, updated_at) pairs }
+        self._pantry_state: Dict[str, int] = {}
+        # Guards all of the above; reentrant because invalidation and lookups nest.
+        self._lock = threading.RLock()
 
-    def _make_key(self, household_id: str, query: str, k: int) -> str:
+    def _make_key(self, household_id: str, query: str, k: int) -> bytes:
+        # 8-byte binary digest: cheaper to hash as a dict key than a hex string.
         raw = f"{household_id}:{query}:{k}"
-        return hashlib.sha256(raw.encode()).hexdigest()
+        return xxhash.xxh3_64_digest(raw.encode())
 
     def get(
         self,
@@ -40,19 +116,87 @@ class RetrieverCache:
         k: int,
     ) -> Optional[Tuple[str, List[Document]]]:
         key = self._make_key(household_id, query, k)
-        entry = self._store.get(key)
+        with self._lock:
+            serialized = self._lookup(household_id, k, key)
+            if serialized is None:
+                return None
+            return serialized, self._documents_for(key)
+
+    def get_serialized(self, household_id: str, query: str, k: int) -> Optional[str]:
+        """Return only the cached context string, for callers that just build prompts."""
+        key = self._make_key(household_id, query, k)
+        with self._lock:
+            return self._lookup(household_id, k, key)
+
+    def get_similar(
+        self,
+        household_id: str,
+        query_vector: Sequence[float],
+        k: int,
+        threshold: float = SEMANTIC_HIT_THRESHOLD,
+    ) -> Optional[Tuple[str, List[Document]]]:
+        """
+        Return the entry whose query embedding is most similar to `query_vector`,
+        if the cosine similarity reaches `threshold`.
+
+        Callers pass the embedding they already computed for the search, so a
+        semantic lookup costs one matrix-vector product and no extra API call.
+        """
+        query = _normalize(query_vector)
+        if query is None:
+            return None
+
+        with self._lock:
+            index = self._semantic.get(household_id, {}).get(k)
+            if index is None:
+                return None
+
+            key, similarity = index.best_match(query)
+            if key is None or similarity < threshold:
+                return None
+
+            logger.debug(
+                "Retriever cache semantic hit",
+                extra={"key": key.hex(), "household_id": household_id, "similarity": round(similarity, 4)},
+            )
+            serialized = self._lookup(household_id, k, key)
+            if serialized is None:
+                return None
+            return serialized, self._documents_for(key)
+
+    def _lookup(self, household_id: str, k: int, key: bytes) -> Optional[str]:
+        # Callers hold self._lock.
+        entry = self._serialized.get(key)
         if not entry:
             return None
 
-        documents, serialized, fetched_at, _ = entry
+        serialized, expires_at_ns = entry
 
         # TTL safety net
-        if time.monotonic() - fetched_at > self._ttl:
-            logger.debug("Retriever cache expired (TTL)", extra={"key": key[:12]})
-            del self._store[key]
+        if time.monotonic_ns() > expires_at_ns:
+            logger.debug("Retriever cache expired (TTL)", extra={"key": key.hex()})
+            self._serialized.pop(key, None)
+            self._documents.pop(key, None)
+            self._pinned.pop(key, None)
+            self._discard_index(household_id, k, key)
             return None
 
-        return serialized, documents
+        return serialized
+
+    def _documents_for(self, key: bytes) -> List[Document]:
+        # A collected list makes this a partial hit: the serialized context is still usable for prompts.
+        documents = self._documents.get(key)
+        if documents is None:
+            return []
+        self._pin(key, documents)
+        return documents
+
+    def _pin(self, key: bytes, documents: _DocList) -> None:
+        # Callers hold self._lock.
+        self._pinned[key] = documents
+        self._pinned.move_to_end(key)
+        while len(self._pinned) > self._max_pinned:
+            self._pinned.popitem(last=False)
 
     def set(
         self,
@@ -61,40 +205,104 @@ class RetrieverCache:
         k: int,
         documents: List[Document],
         serialized: str,
-    ) -> None:
+        query_vector: Optional[Sequence[float]] = None,
+    ) -> List[Document]:
+        """
+        Cache a retrieval result and return the documents as the cached list.
+
+        Callers should hand out the returned list so later hits can share it.
+        """
         key = self._make_key(household_id, query, k)
-        self._store[key] = (documents, serialized, time.monotonic(), household_id)
+        cached_documents = _DocList(documents)
+        normalized = _normalize(query_vector) if query_vector is not None else None
+        with self._lock:
+            self._serialized[key] = (serialized, time.monotonic_ns() + self._ttl_ns)
+            self._documents[key] = cached_documents
+            self._pin(key, cached_documents)
+            self._by_hh[household_id].add(key)
+            if normalized is not None:
+                self._semantic.setdefault(household_id, {}).setdefault(k, _QueryIndex()).add(key, normalized)
         logger.debug(
             "Retriever cache set",
-            extra={"key": key[:12], "household_id": household_id, "docs": len(documents)},
+            extra={"key": key.hex(), "household_id": household_id, "docs": len(documents)},
         )
+        return cached_documents
 
     def invalidate_household(self, household_id: str) -> None:
         """Remove all cached entries for a household."""
-        keys_to_delete = [
-            key
-            for key, (_, _, _, hh_id) in self._store.items()
-            if hh_id == household_id
-        ]
-        for key in keys_to_delete:
-            del self._store[key]
-        self._pantry_state.pop(household_id, None)
+        with self._lock:
+            keys_to_delete = self._by_hh.pop(household_id, ())
+            for key in keys_to_delete:
+                self._serialized.pop(key, None)
+                self._documents.pop(key, None)
+                self._pinned.pop(key, None)
+            self._semantic.pop(household_id, None)
+            self._pantry_state.pop(household_id, None)
         if keys_to_delete:
             logger.info(
                 "Retriever cache invalidated for household",
                 extra={"household_id": household_id, "keys_removed": len(keys_to_delete)},
             )
 
-    def update_pantry_state(self, household_id: str, latest_updated_at: str) -> bool:
+    def _discard_index(self, household_id: str, k: int, key: bytes) -> None:
+        index = self._semantic.get(household_id, {}).get(k)
+        if index is not None:
+            index.discard(key)
+        keys = self._by_hh.get(household_id)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            self._by_hh.pop(household_id, None)
+            self._semantic.pop(household_id, None)
+
+    async def warmup(
+        self,
+        pairs: Sequence[Tuple[str, str, int]],
+        loader: Callable[[str, str, int], object],
+    ) -> None:
+        """
+        Prefill the cache for (household_id, query, k) triples in parallel.
+
+        `loader` runs the full retrieval for one triple (storing its result via `set`)
+        and is executed in a worker thread; failures are logged and skipped.
         """
-        Returns True if the pantry state has changed (cache should be invalidated).
-        Updates the stored state.
+
+        async def _fill(household_id: str, query: str, k: int) -> None:
+            try:
+                await anyio.to_thread.run_sync(lambda: loader(household_id, query, k))
+            except Exception:
+                logger.warning(
+                    "Retriever cache warmup failed",
+                    extra={"household_id": household_id, "k": k},
+                    exc_info=True,
+                )
+
+        await asyncio.gather(*(_fill(household_id, query, k) for household_id, query, k in pairs))
+        logger.info("Retriever cache warmed", extra={"queries": len(pairs)})
+
+    def update_pantry_state(self, household_id: str, item_stamps: Sequence[Tuple[str, str]]) -> bool:
         """
-        previous = self._pantry_state.get(household_id)
-        if previous != latest_updated_at:
-            self._pantry_state[household_id] = latest_updated_at
+        Fingerprint a household's pantry from its (item_id, updated_at) pairs.
+
+        Returns True (after invalidating the household's entries) when the
+        fingerprint differs from the stored one; an unchanged pantry keeps its cache.
+        The first fingerprint for a household (after boot, or after a write already
+        invalidated it) is only recorded, so warmed entries survive.
+        """
+        fingerprint = xxhash.xxh3_64_intdigest(
+            b"\n".join(sorted(f"{item_id}:{updated_at}".encode() for item_id, updated_at in item_stamps))
+        )
+        with self._lock:
+            previous = self._pantry_state.get(household_id)
+            if previous is None:
+                self._pantry_state[household_id] = fingerprint
+                return False
+            if previous == fingerprint:
+                return False
+            self.invalidate_household(household_id)
+            self._pantry_state[household_id] = fingerprint
             return True
-        return False
 
 
 _cache = RetrieverCache(ttl_seconds=300)
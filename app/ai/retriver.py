@@ -1,18 +1,236 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Sequence, Tuple
 from uuid import UUID
 
+import numpy as np
+from langchain_community.vectorstores.utils import maximal_marginal_relevance
 from langchain_core.documents import Document
 from langchain.tools import tool
 
 from app.ai.retriever_cache import get_retriever_cache
 from app.ai.vector_store import get_vector_store
+from app.core.logging import get_logger
+from app.deps.supabase import get_supabase_client
+from app.utils.embedding import embeddings_client
 
+# Reciprocal rank fusion constant; 60 is the value from the original RRF paper.
+RRF_K = 60
+MAX_QUERY_VARIANTS = 8
+# Candidates fetched per query before reranking down to k.
+RERANK_CANDIDATES = 40
+# MMR trade-off: 1.0 ranks purely by relevance, lower values favour diverse items.
+RERANK_LAMBDA = 0.7
+# Candidates whose embeddings are more similar than this to a better-ranked one are dropped.
+DUPLICATE_SIMILARITY = 0.9
 
-# Shared LangChain retriever + cache for pantry RAG flows.
-retriever = get_vector_store().as_retriever()
+# PostgREST ilike wildcards and filter separators are stripped from full-text terms.
+_FTS_UNSAFE = re.compile(r"[%_,()*\\]")
+
+logger = get_logger(__name__)
+
+# Shared LangChain vector store, retriever + cache for pantry RAG flows.
+vector_store = get_vector_store()
+retriever = vector_store.as_retriever()
 _cache = get_retriever_cache()
+_search_pool = ThreadPoolExecutor(
+    # One slot per query variant plus the full-text search.
+    max_workers=MAX_QUERY_VARIANTS + 1,
+    thread_name_prefix="pantry-retriever",
+)
+
+
+def _normalize_queries(query: str, query_variants: Sequence[str] | None) -> List[str]:
+    """Return the query plus its variants, stripped and de-duplicated in order."""
+    queries: List[str] = []
+    for candidate in (query, *(query_variants or ())):
+        normalized = candidate.strip()
+        if normalized and normalized not in queries:
+            queries.append(normalized)
+    return queries[:MAX_QUERY_VARIANTS]
+
+
+def _household_key(household_id: UUID | str | None) -> str:
+    """Cache key for a household; configured ids are canonicalized so they match the tool's UUIDs."""
+    if household_id is None:
+        return "global"
+    try:
+        return str(UUID(str(household_id)))
+    except ValueError:
+        return str(household_id)
+
+
+def _has_embeddings(
+    query_vector: Sequence[float],
+    candidates: Sequence[Tuple[Document, float, np.ndarray]],
+) -> bool:
+    """The match function only returns embeddings when it selects the embedding column."""
+    return all(embedding.shape == (len(query_vector),) for _, _, embedding in candidates)
+
+
+def _drop_near_duplicates(
+    candidates: Sequence[Tuple[Document, float, np.ndarray]],
+) -> List[Tuple[Document, float, np.ndarray]]:
+    """
+    Greedily keep candidates in similarity order, dropping any whose embedding is
+    nearly identical to one already kept (pantry rows repeat the same item a lot).
+    """
+    if len(candidates) < 2:
+        return list(candidates)
+    matrix = np.stack([embedding for _, _, embedding in candidates]).astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix / np.where(norms == 0.0, 1.0, norms)
+    similarities = matrix @ matrix.T
+
+    kept: List[int] = []
+    for index in range(len(candidates)):
+        if not kept or similarities[index, kept].max() <= DUPLICATE_SIMILARITY:
+            kept.append(index)
+    return [candidates[index] for index in kept]
+
+
+def _rerank(
+    query_vector: Sequence[float],
+    candidates: Sequence[Tuple[Document, float, np.ndarray]],
+    top_n: int,
+) -> List[Document]:
+    """
+    Rerank vector search candidates down to top_n with maximal marginal relevance,
+    so near-identical pantry items don't crowd out the rest of the context.
+    """
+    if len(candidates) <= top_n:
+        return [doc for doc, _, _ in candidates]
+    selected = maximal_marginal_relevance(
+        np.asarray(query_vector, dtype=np.float32),
+        [embedding for _, _, embedding in candidates],
+        lambda_mult=RERANK_LAMBDA,
+        k=top_n,
+    )
+    return [candidates[index][0] for index in selected]
+
+
+def _search(query_vector: List[float], k: int) -> List[Document]:
+    """
+    Fetch the nearest RERANK_CANDIDATES items for a query vector, drop near
+    duplicates and rerank the rest to k.
+
+    Falls back to plain similarity order when the match function did not return
+    candidate embeddings.
+    """
+    candidates = vector_store.similarity_search_by_vector_returning_embeddings(
+        query_vector,
+        k=max(k, RERANK_CANDIDATES),
+    )
+    if not _has_embeddings(query_vector, candidates):
+        return [doc for doc, _, _ in candidates[:k]]
+    return _rerank(query_vector, _drop_near_duplicates(candidates), k)
+
+
+def _fts_search(query: str, k: int, household_key: str) -> List[Document]:
+    """
+    Name/category substring match against the embedded pantry content.
+
+    Much cheaper than vector search, so it runs alongside it and its hits are fused
+    into the final ranking. Failures degrade to vector-only results.
+    """
+    term = _FTS_UNSAFE.sub(" ", query).strip()
+    if not term:
+        return []
+    request = (
+        get_supabase_client().table(vector_store.table_name)
+        .select("content, metadata")
+        .ilike("content", f"%{term}%")
+    )
+    if household_key != "global":
+        request = request.eq("metadata->>household_id", household_key)
+    try:
+        response = request.limit(k).execute()
+    except Exception:
+        logger.warning("Pantry full-text search failed", extra={"household_id": household_key}, exc_info=True)
+        return []
+    return [
+        Document(page_content=row.get("content") or "", metadata=row.get("metadata") or {})
+        for row in response.data or []
+    ]
+
+
+def _document_key(doc: Document) -> str:
+    return str(doc.metadata.get("pantry_item_id") or doc.page_content)
+
+
+def _rrf_merge(result_lists: Sequence[List[Document]], k: int) -> List[Document]:
+    """Merge several ranked result lists with reciprocal rank fusion, keeping the top k."""
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            key = _document_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank)
+            documents.setdefault(key, doc)
+    ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+    return [documents[key] for key in ranked[:k]]
+
+
+def _embed_queries(queries: List[str]) -> List[List[float]]:
+    """Embed the query set in one batch request."""
+    return embeddings_client().embed_documents(queries, task_type="RETRIEVAL_QUERY")
+
+
+def _cache_result(
+    household_key: str,
+    cache_query: str,
+    k: int,
+    documents: List[Document],
+    query_vector: List[float] | None,
+) -> Tuple[str, List[Document]]:
+    serialized = "\n\n".join(doc.page_content for doc in documents)
+    return serialized, _cache.set(household_key, cache_query, k, documents, serialized, query_vector=query_vector)
+
+
+def _with_documents(cached: Tuple[str, List[Document]] | None) -> Tuple[str, List[Document]] | None:
+    """
+    Treat a cache entry whose documents were already freed as a miss.
+
+    Only the most recently used Document lists are kept alive, so an older hit can
+    carry the context string alone. The tool still answers from that string; the
+    stream yields documents and needs them. An empty context string is a genuine
+    empty result and stays a hit.
+    """
+    if cached is None or (cached[0] and not cached[1]):
+        return None
+    return cached
+
+
+def _retrieve(household_key: str, queries: List[str], k: int) -> Tuple[str, List[Document]]:
+    if not queries:
+        return "", []
+
+    cache_query = "\n".join(sorted(queries))
+    # A hit whose documents were freed still returns its context string, with an empty artifact.
+    cached = _cache.get(household_key, cache_query, k)
+    if cached is not None:
+        return cached
+
+    # Full-text search on the primary query runs while the query set is embedded and searched.
+    fts_future = _search_pool.submit(_fts_search, queries[0], k, household_key)
+    vectors = _embed_queries(queries)
+    query_vector = vectors[0] if len(vectors) == 1 else None
+    if query_vector is not None:
+        # Paraphrases of an already-answered query reuse its results.
+        similar = _cache.get_similar(household_key, query_vector, k)
+        if similar is not None:
+            fts_future.cancel()
+            return similar
+        vector_documents = _search(query_vector, k)
+    else:
+        result_lists = list(_search_pool.map(lambda vector: _search(vector, k), vectors))
+        vector_documents = _rrf_merge(result_lists, k)
+
+    documents = _rrf_merge([vector_documents, fts_future.result()], k)
+    return _cache_result(household_key, cache_query, k, documents, query_vector)
 
 
 @tool(response_format="content_and_artifact")
@@ -20,23 +238,89 @@ def retrieve_pantry_items(
     query: str,
     k: int = 5,
     household_id: UUID | None = None,
+    query_variants: List[str] | None = None,
 ) -> Tuple[str, List[Document]]:
     """
     Retrieve relevant pantry items from the Supabase-backed vector store
     to help answer a user query.
 
-    Results are cached per-household and query to avoid redundant vector lookups.
+    Each query fetches a wider candidate set that is de-duplicated and
+    reranked down to k.
+    Optional query variants (e.g. multi-query or HyDE rewrites) are embedded
+    together with the query in a single batch request, searched concurrently,
+    and merged with reciprocal rank fusion.
+
+    A cheap full-text match on item names runs concurrently and is fused in
+    with the vector results.
+
+    Results are cached per-household and query set to avoid redundant vector lookups.
     """
-    household_key = str(household_id) if household_id is not None else "global"
+    household_key = _household_key(household_id)
+    return _retrieve(household_key, _normalize_queries(query, query_variants), k)
+
+
+retriever_tool = retrieve_pantry_items
 
-    cached = _cache.get(household_key, query, k)
+
+async def retrieve_pantry_items_stream(
+    query: str,
+    k: int = 5,
+    household_id: UUID | None = None,
+    query_variants: List[str] | None = None,
+) -> AsyncIterator[List[Document]]:
+    """
+    Streaming variant of `retrieve_pantry_items`.
+
+    Yields the full-text matches as soon as they arrive, then the final fused
+    ranking once vector search completes. Exact cache hits are yielded once;
+    semantic hits replace the vector search after the full-text matches.
+    """
+    household_key = _household_key(household_id)
+    queries = _normalize_queries(query, query_variants)
+    if not queries:
+        return
+
+    cache_query = "\n".join(sorted(queries))
+    cached = _with_documents(_cache.get(household_key, cache_query, k))
     if cached is not None:
-        return cached
+        yield cached[1]
+        return
 
-    documents = retriever.get_relevant_documents(query)[:k]
-    serialized = "\n\n".join(doc.page_content for doc in documents)
-    _cache.set(household_key, query, k, documents, serialized)
-    return serialized, documents
+    loop = asyncio.get_running_loop()
+    fts_task = loop.run_in_executor(_search_pool, _fts_search, queries[0], k, household_key)
+    # Embedding runs on the default executor; the per-variant searches are started from
+    # here, so no _search_pool worker ever blocks waiting on other _search_pool work.
+    embed_task = loop.run_in_executor(None, _embed_queries, queries)
 
+    fts_documents = await fts_task
+    if fts_documents:
+        yield fts_documents
 
-retriever_tool = retrieve_pantry_items
+    vectors = await embed_task
+    query_vector = vectors[0] if len(vectors) == 1 else None
+    if query_vector is not None:
+        # Paraphrases of an already-answered query reuse its results, as in _retrieve.
+        similar = _with_documents(_cache.get_similar(household_key, query_vector, k))
+        if similar is not None:
+            yield similar[1]
+            return
+
+    result_lists = await asyncio.gather(
+        *(loop.run_in_executor(_search_pool, _search, vector, k) for vector in vectors)
+    )
+    vector_documents = result_lists[0] if query_vector is not None else _rrf_merge(result_lists, k)
+    documents = _rrf_merge([vector_documents, fts_documents], k)
+    yield _cache_result(household_key, cache_query, k, documents, query_vector)[1]
+
+
+async def warmup_retriever_cache(pairs: Sequence[Tuple[str, str, int]]) -> None:
+    """
+    Run retrievals for known hot (household_id, query, k) triples so their first request hits the cache.
+
+    Keys are built exactly as `retrieve_pantry_items` builds them, so a warmed entry
+    is what the tool finds for the same household and query.
+    """
+    await _cache.warmup(
+        [(_household_key(household_id), query, k) for household_id, query, k in pairs],
+        lambda household_key, query, k: _retrieve(household_key, _normalize_queries(query, None), k),
+    )
@@ -1,17 +1,22 @@
+from functools import lru_cache
+
 from langchain_community.vectorstores import SupabaseVectorStore
 from app.utils.embedding import embeddings_client
 from app.deps.supabase import get_supabase_client
 
 
+@lru_cache(maxsize=1)
 def get_vector_store() -> SupabaseVectorStore:
     """
     Get or create the vector store instance.
+
+    Uses LRU cache to ensure a single vector store is reused across callers.
+    It only wraps the (already cached) Supabase and embeddings clients, so it
+    can be safely shared.
     """
-    
-    
     return SupabaseVectorStore(
         client=get_supabase_client(),
         embedding=embeddings_client(),
         table_name="pantry_embeddings",
         query_name="match_pantry_items",
-    )
\ No newline at end of file
+    )
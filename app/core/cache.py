@@ -1,34 +1,52 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
+import pickle
 import time
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
 from functools import wraps
 from typing import Any, TypeVar
 
+import xxhash
+
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 T = TypeVar("T")
 
+NS_PER_SECOND = 1_000_000_000
+
 
 class TTLCache:
     """
     In-memory TTL cache for caching function results.
     
-    Stores key-value pairs with expiration times. Automatically evicts
-    expired entries on access.
+    Stores key-value pairs with expiration times. Entries are kept in LRU
+    order and bounded by ``max_entries``; a min-heap of expiry times lets
+    expired entries be evicted in O(log n) without scanning the whole cache.
     """
 
-    def __init__(self, default_ttl_seconds: int = 300) -> None:
+    def __init__(self, default_ttl_seconds: int = 300, max_entries: int = 10_000) -> None:
         """
         Initialize cache with default TTL.
         
         Args:
             default_ttl_seconds: Default time-to-live in seconds (default: 5 minutes)
+            max_entries: Maximum number of entries before least recently used ones are evicted
         """
-        self._cache: dict[str, tuple[Any, float]] = {}
+        # { key: (value, expiry_ns) } with expiries on the time.monotonic_ns() clock
+        self._cache: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        # (expiry_ns, key) min-heap; may hold stale pairs for overwritten or deleted keys.
+        self._expiry_heap: list[tuple[int, str]] = []
+        # In-flight async loads per key, shared by concurrent callers on a cache miss.
+        # Deleting a key drops its entry here too, so a load started before the delete
+        # still answers its own callers but never stores its (possibly stale) result.
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
         self.default_ttl_seconds = default_ttl_seconds
+        self.max_entries = max_entries
 
     def get(self, key: str) -> Any | None:
         """
@@ -40,18 +58,15 @@ class TTLCache:
         Returns:
             Cached value or None if not found or expired
         """
-        if key not in self._cache:
-            return None
-        
-        value, expiry_time = self._cache[key]
-        
-        if time.time() > expiry_time:
-            del self._cache[key]
-            logger.debug("Cache entry expired", extra={"key": key})
+        self._evict_expired()
+
+        entry = self._cache.get(key)
+        if entry is None:
             return None
         
+        self._cache.move_to_end(key)
         logger.debug("Cache hit", extra={"key": key})
-        return value
+        return entry[0]
 
     def set(self, key: str, value: Any, ttl_seconds: int | None = None) -> None:
         """
@@ -63,32 +78,65 @@ class TTLCache:
             ttl_seconds: Time-to-live in seconds (uses default if None)
         """
         ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds
-        expiry_time = time.time() + ttl
-        self._cache[key] = (value, expiry_time)
+        expiry_ns = time.monotonic_ns() + int(ttl * NS_PER_SECOND)
+        self._cache[key] = (value, expiry_ns)
+        self._cache.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (expiry_ns, key))
         logger.debug("Cache entry set", extra={"key": key, "ttl_seconds": ttl})
 
+        self._evict_expired()
+        while len(self._cache) > self.max_entries:
+            evicted_key, _ = self._cache.popitem(last=False)
+            logger.debug("Cache entry evicted (LRU)", extra={"key": evicted_key})
+        self._compact_heap()
+
     def delete(self, key: str) -> None:
-        """Delete a cache entry."""
-        if key in self._cache:
-            del self._cache[key]
+        """Delete a cache entry and detach any in-flight load for it."""
+        self._inflight.pop(key, None)
+        if self._cache.pop(key, None) is not None:
             logger.debug("Cache entry deleted", extra={"key": key})
 
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete several cache entries in one call."""
+        pop = self._cache.pop
+        pop_inflight = self._inflight.pop
+        deleted = []
+        for key in keys:
+            pop_inflight(key, None)
+            if pop(key, None) is not None:
+                deleted.append(key)
+        if deleted:
+            logger.debug("Cache entries deleted", extra={"keys": deleted})
+
     def clear(self) -> None:
         """Clear all cache entries."""
         self._cache.clear()
+        self._expiry_heap.clear()
+        self._inflight.clear()
         logger.debug("Cache cleared")
 
     def _evict_expired(self) -> None:
-        """Remove all expired entries."""
-        current_time = time.time()
-        expired_keys = [
-            key for key, (_, expiry_time) in self._cache.items() if current_time > expiry_time
-        ]
-        for key in expired_keys:
-            del self._cache[key]
+        """Pop expired entries from the top of the expiry heap."""
+        now_ns = time.monotonic_ns()
+        heap = self._expiry_heap
+        evicted = 0
+        while heap and now_ns > heap[0][0]:
+            expiry_ns, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Skip stale heap pairs left behind by overwritten or deleted keys.
+            if entry is not None and entry[1] == expiry_ns:
+                del self._cache[key]
+                evicted += 1
         
-        if expired_keys:
-            logger.debug("Evicted expired entries", extra={"count": len(expired_keys)})
+        if evicted:
+            logger.debug("Evicted expired entries", extra={"count": evicted})
+
+    def _compact_heap(self) -> None:
+        """Rebuild the expiry heap once stale pairs outnumber live entries."""
+        if len(self._expiry_heap) <= 2 * len(self._cache) + 64:
+            return
+        self._expiry_heap = [(expiry_ns, key) for key, (_, expiry_ns) in self._cache.items()]
+        heapq.heapify(self._expiry_heap)
 
     def size(self) -> int:
         """Return number of entries in cache."""
@@ -104,17 +152,120 @@ def get_cache() -> TTLCache:
     return _global_cache
 
 
+def _default_cache_key(func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    """
+    Build a compact cache key from a function and its call arguments.
+
+    Arguments are pickled and hashed with xxh3; unpicklable arguments fall back
+    to their repr so the decorator keeps working for arbitrary callers.
+    """
+    try:
+        raw = pickle.dumps(
+            (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items()))),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    except (pickle.PicklingError, TypeError, AttributeError):
+        raw = f"{func.__module__}:{func.__qualname__}:{args!r}:{sorted(kwargs.items())!r}".encode()
+    return f"{func.__name__}:{xxhash.xxh3_64_hexdigest(raw)}"
+
+
+def _make_async_wrapper(
+    func: Callable[..., Any],
+    cache: TTLCache,
+    ttl_seconds: int,
+    key_func: Callable[..., str] | None,
+) -> Callable[..., Any]:
+    # Bound once per decorated function to skip attribute lookups on every call.
+    _get = cache.get
+    _set = cache.set
+    inflight = cache._inflight
+
+    @wraps(func)
+    async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+        cache_key = key_func(*args, **kwargs) if key_func else _default_cache_key(func, args, kwargs)
+
+        cached_value = _get(cache_key)
+        if cached_value is not None:
+            return cached_value
+
+        # Coalesce concurrent misses: only the first caller runs func, the rest await it.
+        pending = inflight.get(cache_key)
+        while pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    # This caller was cancelled, not the one running the load.
+                    raise
+            # The loading caller was cancelled; use its result if it landed, otherwise load here.
+            cached_value = _get(cache_key)
+            if cached_value is not None:
+                return cached_value
+            pending = inflight.get(cache_key)
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        inflight[cache_key] = future
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved so a caller without waiters doesn't log a warning.
+            future.exception()
+            raise
+        else:
+            # Skip the store if the key was deleted (invalidated) while this load ran.
+            if inflight.get(cache_key) is future:
+                _set(cache_key, result, ttl_seconds=ttl_seconds)
+            future.set_result(result)
+            return result
+        finally:
+            if inflight.get(cache_key) is future:
+                del inflight[cache_key]
+
+    return async_wrapper
+
+
+def _make_sync_wrapper(
+    func: Callable[..., Any],
+    cache: TTLCache,
+    ttl_seconds: int,
+    key_func: Callable[..., str] | None,
+) -> Callable[..., Any]:
+    _get = cache.get
+    _set = cache.set
+
+    @wraps(func)
+    def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+        cache_key = key_func(*args, **kwargs) if key_func else _default_cache_key(func, args, kwargs)
+
+        cached_value = _get(cache_key)
+        if cached_value is not None:
+            return cached_value
+
+        result = func(*args, **kwargs)
+        _set(cache_key, result, ttl_seconds=ttl_seconds)
+        return result
+
+    return sync_wrapper
+
+
 def cached(
     ttl_seconds: int = 300,
     key_func: Callable[..., str] | None = None,
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
     Decorator to cache function results with TTL.
+
+    For coroutine functions, concurrent calls that miss on the same key share a
+    single in-flight call instead of each hitting the upstream service.
     
     Args:
         ttl_seconds: Time-to-live in seconds for cached results
         key_func: Optional function to generate cache key from args/kwargs.
-                  Defaults to str(args) + str(sorted(kwargs.items()))
+                  Defaults to an xxh3 hash of the pickled function name, args and kwargs
     
     Example:
         @cached(ttl_seconds=60)
@@ -124,39 +275,9 @@ def cached(
     cache = get_cache()
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        @wraps(func)
-        async def async_wrapper(*args: Any, **kwargs: Any) -> T:
-            if key_func:
-                cache_key = key_func(*args, **kwargs)
-            else:
-                cache_key = f"{func.__name__}:{str(args)}:{str(sorted(kwargs.items()))}"
-            
-            cached_value = cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-            
-            result = await func(*args, **kwargs)
-            cache.set(cache_key, result, ttl_seconds=ttl_seconds)
-            return result
-
-        @wraps(func)
-        def sync_wrapper(*args: Any, **kwargs: Any) -> T:
-            if key_func:
-                cache_key = key_func(*args, **kwargs)
-            else:
-                cache_key = f"{func.__name__}:{str(args)}:{str(sorted(kwargs.items()))}"
-            
-            cached_value = cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-            
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl_seconds=ttl_seconds)
-            return result
-
-        if hasattr(func, "__code__") and func.__code__.co_flags & 0x80:  # CO_COROUTINE
-            return async_wrapper
-        return sync_wrapper
+        if asyncio.iscoroutinefunction(func):
+            return _make_async_wrapper(func, cache, ttl_seconds, key_func)
+        return _make_sync_wrapper(func, cache, ttl_seconds, key_func)
 
     return decorator
 
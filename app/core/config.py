@@ -1,12 +1,19 @@
 from __future__ import annotations
 from dotenv import load_dotenv
-import os
 import ast
+import os
+from functools import lru_cache
+from typing import Annotated
 from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+
+_ENV_LOADED_FLAG = "PANTRY_ENV_LOADED"
 
-# Load environment variables from a .env file into the process environment
-load_dotenv()
+# Load environment variables from a .env file into the process environment once;
+# worker processes inherit the populated environment and skip re-reading the file.
+if _ENV_LOADED_FLAG not in os.environ:
+    load_dotenv()
+    os.environ[_ENV_LOADED_FLAG] = "1"
 
 
 def str_to_bool(value: str) -> bool:
@@ -47,55 +54,84 @@ class AppSettings(BaseSettings):
     Centralized application settings loaded from environment vars or .env using Pydantic's BaseSettings.
     """
     model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
+        # .env is loaded into os.environ above, so pydantic doesn't read the file again.
+        env_file=None,
         extra="ignore",
+        populate_by_name=True,
     )
 
-    app_env: str = os.getenv("APP_ENV", "development")
-    app_name: str = os.getenv("APP_NAME", "pantry-server")
-
-    supabase_url: str = os.getenv("SUPABASE_URL", "")
-    supabase_anon_key: str = os.getenv("SUPABASE_ANON_KEY", "")
-    supabase_service_role_key: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
-
-    google_genai_api_key: str = os.getenv("GOOGLE_GENERATIVE_AI_API_KEY", "")
-
-    port: int = int(os.getenv("PORT", "8000"))
-
-    host: str = os.getenv("HOST", "0.0.0.0")
-    reload: bool = str_to_bool(os.getenv("RELOAD", "True"))
-
-    gemini_model: str = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
-    gemini_temperature: float = Field(
-        default=float(os.getenv("GEMINI_TEMPERATURE", "0.0")),
-    )
-    gemini_max_tokens: int | None = parse_int_or_none(
-        os.getenv("GEMINI_MAX_TOKENS", "1000")
-    )
-    gemini_max_retries: int = int(os.getenv("GEMINI_MAX_RETRIES", "2"))
-    gemini_embeddings_model: str = os.getenv(
-        "GEMINI_EMBEDDINGS_MODEL", "gemini-embedding-001"
-    )
-    gemini_embeddings_output_dimensionality: int = int(
-        os.getenv("GEMINI_EMBEDDINGS_OUTPUT_DIMENSIONALITY", "768")
-    )
-
-    rate_limit_enabled: bool = str_to_bool(os.getenv("RATE_LIMIT_ENABLED", "True"))
-    rate_limit_per_minute: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
-
-    enable_background_workers: bool = str_to_bool(os.getenv("ENABLE_BACKGROUND_WORKERS", "True"))
-    embedding_batch_size: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "50"))
-    embedding_worker_interval: int = int(os.getenv("EMBEDDING_WORKER_INTERVAL", "5"))
+    app_env: str = "development"
+    app_name: str = "pantry-server"
+    # Expose unhandled exception messages in 500 responses.
+    debug: bool = False
+
+    supabase_url: str = ""
+    supabase_anon_key: str = ""
+    supabase_service_role_key: str = ""
+    # Keep-alive connections opened on the async Supabase client at startup (0 disables).
+    supabase_warmup_connections: int = 4
+    # HS256 secret for verifying access tokens locally; when empty every request asks Supabase Auth.
+    supabase_jwt_secret: str = ""
+
+    google_genai_api_key: str = Field(default="", validation_alias="GOOGLE_GENERATIVE_AI_API_KEY")
+
+    port: int = 8000
+
+    host: str = "0.0.0.0"
+    reload: bool = True
+
+    gemini_model: str = "gemini-2.5-flash"
+    gemini_temperature: float = 0.0
+    gemini_max_tokens: int | None = 1000
+    gemini_max_retries: int = 2
+    gemini_embeddings_model: str = "gemini-embedding-001"
+    gemini_embeddings_output_dimensionality: int = 768
+
+    rate_limit_enabled: bool = True
+    rate_limit_per_minute: int = 60
+    # "fixed_window" (in-process per-IP counter) or "slowapi".
+    rate_limit_backend: str = "fixed_window"
+    # Shared limiter storage (e.g. redis://host:6379/0); selects the slowapi backend so
+    # every worker enforces the same counters.
+    redis_url: str = ""
+
+    enable_background_workers: bool = True
+    embedding_batch_size: int = 50
+    embedding_worker_interval: int = 5
+
+    log_level: str = "INFO"
+
+    # "household_id:query" entries whose retrievals are prefetched at startup.
+    retriever_hot_queries: Annotated[list[str], NoDecode] = []
+    retriever_warmup_k: int = 5
+
+    # NoDecode: CORS_ORIGINS is a Python list literal or comma-separated string, not JSON.
+    cors_origins: Annotated[list[str], NoDecode] = [
+        "http://localhost:3000",
+        "http://localhost:5173",
+        "*",
+    ]
+
+    @field_validator("debug", "reload", "rate_limit_enabled", "enable_background_workers", mode="before")
+    @classmethod
+    def parse_bool(cls, value: object) -> object:
+        if isinstance(value, str):
+            return str_to_bool(value)
+        return value
 
-    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    @field_validator("gemini_max_tokens", mode="before")
+    @classmethod
+    def parse_gemini_max_tokens(cls, value: object) -> object:
+        if isinstance(value, str):
+            return parse_int_or_none(value)
+        return value
 
-    cors_origins: list[str] = parse_cors_origins(
-        os.getenv(
-            "CORS_ORIGINS",
-            "['http://localhost:3000', 'http://localhost:5173', '*']",
-        )
-    )
+    @field_validator("cors_origins", "retriever_hot_queries", mode="before")
+    @classmethod
+    def parse_string_list(cls, value: object) -> object:
+        if isinstance(value, str):
+            return parse_cors_origins(value)
+        return value
 
     @field_validator("gemini_temperature")
     @classmethod
@@ -120,9 +156,22 @@ class AppSettings(BaseSettings):
             )
         return value
 
-settings = AppSettings()
+def parse_hot_queries(entries: list[str], k: int) -> list[tuple[str, str, int]]:
+    """Split "household_id:query" entries into (household_id, query, k) triples, skipping malformed ones."""
+    pairs: list[tuple[str, str, int]] = []
+    for entry in entries:
+        household_id, _, query = entry.partition(":")
+        if household_id.strip() and query.strip():
+            pairs.append((household_id.strip(), query.strip(), k))
+    return pairs
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> AppSettings:
-    """Return the application settings instance."""
-    return settings
+    """
+    Return the application settings instance.
+
+    Settings are parsed from the environment on first use and cached; tests can
+    call ``get_settings.cache_clear()`` after changing the environment.
+    """
+    return AppSettings()
@@ -1,17 +1,53 @@
 from __future__ import annotations
 
 import logging
+from enum import Enum
+from http import HTTPStatus
 from collections.abc import Awaitable, Callable
 
-from fastapi import FastAPI, Request, status
+import orjson
+from fastapi import FastAPI, Request, Response, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.core.config import settings
+from app.core.config import get_settings
+from app.core.responses import OrjsonResponse
 
 logger = logging.getLogger(__name__)
 
+# Body returned for unhandled exceptions when messages are hidden, serialized once.
+_GENERIC_500 = orjson.dumps(
+    {
+        "error": "Internal server error",
+        "message": "An unexpected error occurred",
+    }
+)
+
+def _orjson_default(obj: object) -> object:
+    """Encode the non-JSON values pydantic puts in validation errors (input bytes, enums, exceptions in ctx)."""
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode("utf-8", "replace")
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+_DEFAULT_PHRASES = {code.value: code.phrase for code in HTTPStatus}
+# { status_code: body } for HTTP exceptions carrying their default reason phrase (404, 405, ...).
+_STATUS_BODY_CACHE: dict[int, bytes] = {}
+
+
+def _http_error_body(status_code: int, detail: object) -> bytes:
+    is_default_phrase = detail == _DEFAULT_PHRASES.get(status_code)
+    if is_default_phrase:
+        cached = _STATUS_BODY_CACHE.get(status_code)
+        if cached is not None:
+            return cached
+    body = orjson.dumps({"error": detail, "status_code": status_code})
+    if is_default_phrase:
+        _STATUS_BODY_CACHE[status_code] = body
+    return body
+
 
 class AppError(Exception):
     """Application error with HTTP status and detail for API responses."""
@@ -28,9 +64,9 @@ class AppError(Exception):
         self.headers = headers or {}
 
 
-async def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
+async def app_error_handler(request: Request, exc: AppError) -> OrjsonResponse:
     """Handle AppError by returning a JSON response with status and detail."""
-    return JSONResponse(
+    return OrjsonResponse(
         status_code=exc.status_code,
         content={"error": exc.message, "status_code": exc.status_code},
         headers=exc.headers,
@@ -41,7 +77,7 @@ def create_unhandled_exception_handler(
     *,
     app_env: str,
     debug: bool | None = None,
-) -> Callable[[Request, Exception], Awaitable[JSONResponse]]:
+) -> Callable[[Request, Exception], Awaitable[Response]]:
     """
     Return an async exception handler for unhandled Exception.
 
@@ -50,14 +86,18 @@ def create_unhandled_exception_handler(
     """
     show_message = debug if debug is not None else (app_env.lower() == "development")
 
-    async def handler(request: Request, exc: Exception) -> JSONResponse:
+    async def handler(request: Request, exc: Exception) -> Response:
         logger.error("Unhandled exception: %s", exc, exc_info=True)
-        return JSONResponse(
+        if not show_message:
+            # The exception is never stringified for the response outside debug.
+            return Response(
+                content=_GENERIC_500,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                media_type="application/json",
+            )
+        return OrjsonResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "error": "Internal server error",
-                "message": str(exc) if show_message else "An unexpected error occurred",
-            },
+            content={"error": "Internal server error", "message": str(exc)},
         )
 
     return handler
@@ -74,41 +114,45 @@ def setup_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(StarletteHTTPException)
     async def http_exception_handler(
         request: Request, exc: StarletteHTTPException
-    ) -> JSONResponse:
+    ) -> Response:
         """
         Handle HTTP exceptions (e.g., 404 Not Found, 403 Forbidden).
 
         Returns a JSON response with the original status code and error detail.
         """
-        return JSONResponse(
+        return Response(
+            content=_http_error_body(exc.status_code, exc.detail),
             status_code=exc.status_code,
-            content={
-                "error": exc.detail,
-                "status_code": exc.status_code,
-            },
+            headers=exc.headers,
+            media_type="application/json",
         )
 
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(
         request: Request, exc: RequestValidationError
-    ) -> JSONResponse:
+    ) -> Response:
         """
         Handle validation errors (e.g., request payload/data is invalid with respect to OpenAPI schema).
 
         Returns a JSON response containing details about validation errors.
+        The errors are serialized once with orjson; values it can't encode
+        are handled by `_orjson_default` rather than a jsonable_encoder pass.
         """
-        return JSONResponse(
+        return Response(
+            content=orjson.dumps(
+                {"error": "Validation error", "details": exc.errors()},
+                default=_orjson_default,
+            ),
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content={
-                "error": "Validation error",
-                "details": exc.errors(),
-            },
+            media_type="application/json",
         )
 
+    show_message = bool(get_settings().debug)
+
     @app.exception_handler(Exception)
     async def general_exception_handler(
         request: Request, exc: Exception
-    ) -> JSONResponse:
+    ) -> Response:
         """
         Handle all unhandled and unexpected exceptions.
 
@@ -117,14 +161,15 @@ def setup_exception_handlers(app: FastAPI) -> None:
         Otherwise, a generic error message is shown to the client.
         """
         logger.error("Unexpected error: %s", exc, exc_info=True)
-        return JSONResponse(
+        if not show_message:
+            return Response(
+                content=_GENERIC_500,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                media_type="application/json",
+            )
+        return OrjsonResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "error": "Internal server error",
-                "message": (
-                    str(exc) if settings.debug else "An unexpected error occurred"
-                ),
-            },
+            content={"error": "Internal server error", "message": str(exc)},
         )
 
 
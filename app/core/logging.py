@@ -1,30 +1,174 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, TextIO
 
-PRODUCTION_ENV_VALUES = frozenset({"prod", "production"})
+import orjson
+
+# Lowercased APP_ENV -> root log level; environments not listed log at DEBUG.
+_ENV_TO_LOG_LEVEL: dict[str, int] = {
+    "prod": logging.INFO,
+    "production": logging.INFO,
+}
+PRODUCTION_ENV_VALUES = frozenset(env for env, level in _ENV_TO_LOG_LEVEL.items() if level == logging.INFO)
+
+# Seconds between background flushes of buffered log output.
+LOG_FLUSH_INTERVAL_SECONDS = 0.1
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`.
+_RESERVED_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+}
+
+_listener: QueueListener | None = None
+# (app_env, log_level) of the active configuration; repeated identical calls are no-ops.
+_configured: tuple[str, int] | None = None
+
+
+def resolve_log_level(app_env: str) -> int:
+    """Return the root log level for an APP_ENV value."""
+    return _ENV_TO_LOG_LEVEL.get(app_env.lower(), logging.DEBUG)
+
+
+class OrjsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including any `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": record.created,
+            "lvl": record.levelname,
+            "name": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode()
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders `%(asctime)s` at second resolution and reuses the
+    string for every record logged within the same second.
+    """
+
+    default_time_format = "%Y-%m-%dT%H:%M:%S"
+
+    def __init__(self, fmt: str | None = None) -> None:
+        super().__init__(fmt=fmt)
+        self._last_second = -1
+        self._last_formatted = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_formatted = time.strftime(self.default_time_format, self.converter(second))
+            self._last_second = second
+        return self._last_formatted
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that flushes on a timer instead of after every record.
+
+    Runs behind a QueueListener, so writes already happen off the request path;
+    batching flushes cuts the number of write syscalls under load.
+    """
+
+    def __init__(self, stream: TextIO, flush_interval: float) -> None:
+        super().__init__(stream)
+        self._stop_flushing = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(flush_interval,),
+            name="log-flusher",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def flush(self) -> None:
+        # StreamHandler.emit() flushes after each record; defer to the flusher thread.
+        pass
+
+    def _flush_stream(self) -> None:
+        with self.lock:
+            try:
+                self.stream.flush()
+            except ValueError:
+                # Stream already closed (e.g. interpreter shutdown or test capture teardown).
+                pass
+
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._stop_flushing.wait(interval):
+            self._flush_stream()
+
+    def close(self) -> None:
+        self._stop_flushing.set()
+        self._flush_stream()
+        super().close()
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
 
 
 def configure_logging(*, app_env: str) -> None:
-    log_level = (
-        logging.INFO if app_env.lower() in PRODUCTION_ENV_VALUES else logging.DEBUG
-    )
+    """
+    Route all logging through a queue to a background listener thread.
+
+    Production emits JSON lines via `OrjsonFormatter`; other environments keep
+    the human-readable format.
+    """
+    global _listener, _configured
+
+    log_level = resolve_log_level(app_env)
+    if _configured == (app_env, log_level):
+        return
 
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
-    handler = logging.StreamHandler(sys.stdout)
+    handler = _BufferedStreamHandler(sys.stdout, LOG_FLUSH_INTERVAL_SECONDS)
     handler.setLevel(log_level)
-    handler.setFormatter(
-        logging.Formatter(
-            fmt="%(asctime)s %(levelname)s %(name)s %(message)s",
-            datefmt="%Y-%m-%dT%H:%M:%S",
-        )
-    )
+    if app_env.lower() in PRODUCTION_ENV_VALUES:
+        handler.setFormatter(OrjsonFormatter())
+    else:
+        handler.setFormatter(CachedTimeFormatter(fmt="%(asctime)s %(levelname)s %(name)s %(message)s"))
+
+    _stop_listener()
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
 
     root_logger.handlers.clear()
-    root_logger.addHandler(handler)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _configured = (app_env, log_level)
+
+
+def reset_logging_for_tests() -> None:
+    """Stop the listener and forget the active configuration so the next configure_logging() call applies."""
+    global _configured
+    _stop_listener()
+    logging.getLogger().handlers.clear()
+    _configured = None
+
+
+atexit.register(_stop_listener)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -32,4 +176,11 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
-__all__ = ["configure_logging", "get_logger"]
+__all__ = [
+    "CachedTimeFormatter",
+    "OrjsonFormatter",
+    "configure_logging",
+    "get_logger",
+    "reset_logging_for_tests",
+    "resolve_log_level",
+]
@@ -1,76 +1,97 @@
 from __future__ import annotations
 
-import time
-import uuid
-from collections.abc import Awaitable, Callable
+import logging
+from collections.abc import Mapping
+from time import perf_counter_ns
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging import get_logger
+from app.core.trace_id import new_trace_id
 
 logger = get_logger(__name__)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestObservabilityMiddleware:
     """
-    Middleware for request/response logging with trace IDs and latency tracking.
-    
+    Pure ASGI middleware for request/response logging with trace IDs and latency tracking.
+
     Generates a unique trace ID for each request and logs:
-    - Request method, path, query params
+    - Request method, path, raw query string
     - Response status code
     - Request latency in milliseconds
     - Trace ID for correlation
+
+    Adds X-Trace-Id, X-Response-Time-Ms and x-app-name response headers. Unlike
+    BaseHTTPMiddleware it wraps `send` directly, so no extra task or stream is
+    created per request.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        trace_id = str(uuid.uuid4())
-        request.state.trace_id = trace_id
-        
-        start_time = time.time()
-        
-        method = request.method
-        path = request.url.path
-        query_params = dict(request.query_params)
-        
-        logger.info(
-            "Request started",
-            extra={
-                "trace_id": trace_id,
-                "method": method,
-                "path": path,
-                "query_params": query_params,
-                "client_host": request.client.host if request.client else None,
-            },
-        )
-        
-        try:
-            response = await call_next(request)
-            status_code = response.status_code
-            
-            latency_ms = (time.time() - start_time) * 1000
-            
+    def __init__(self, app: ASGIApp, app_name: str) -> None:
+        self.app = app
+        self._app_name_header = (b"x-app-name", app_name.encode("latin-1"))
+        # Starlette builds the middleware stack on the first request, after configure_logging(),
+        # so the level check is resolved once here instead of per request.
+        self._log_info = logger.isEnabledFor(logging.INFO)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = new_trace_id()
+        # Exposed to handlers as request.state.trace_id.
+        scope.setdefault("state", {})["trace_id"] = trace_id
+
+        start_ns = perf_counter_ns()
+
+        method = scope["method"]
+        path = scope["path"]
+        log_info = self._log_info
+
+        if log_info:
+            client = scope.get("client")
             logger.info(
-                "Request completed",
+                "Request started",
                 extra={
                     "trace_id": trace_id,
                     "method": method,
                     "path": path,
-                    "status_code": status_code,
-                    "latency_ms": round(latency_ms, 2),
+                    # Raw query string as sent; parsing it into a dict is left to log consumers.
+                    "query_string": scope.get("query_string", b"").decode("ascii", "replace") or None,
+                    "client_host": client[0] if client else None,
                 },
             )
-            
-            response.headers["X-Trace-Id"] = trace_id
-            response.headers["X-Response-Time-Ms"] = str(round(latency_ms, 2))
-            
-            return response
-            
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                latency_ms = (perf_counter_ns() - start_ns) / 1_000_000.0
+                latency_str = f"{latency_ms:.2f}"
+
+                if log_info:
+                    logger.info(
+                        "Request completed",
+                        extra={
+                            "trace_id": trace_id,
+                            "method": method,
+                            "path": path,
+                            "status_code": message["status"],
+                            "latency_ms": latency_str,
+                        },
+                    )
+
+                headers = list(message.get("headers", ()))
+                headers.append((b"x-trace-id", trace_id.encode("latin-1")))
+                headers.append((b"x-response-time-ms", latency_str.encode("latin-1")))
+                headers.append(self._app_name_header)
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
-            latency_ms = (time.time() - start_time) * 1000
-            
+            latency_ms = (perf_counter_ns() - start_ns) / 1_000_000.0
+
             logger.error(
                 "Request failed",
                 extra={
@@ -78,12 +99,32 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                     "method": method,
                     "path": path,
                     "error": str(exc),
-                    "latency_ms": round(latency_ms, 2),
+                    "latency_ms": f"{latency_ms:.2f}",
                 },
                 exc_info=True,
             )
-            
+
             raise
 
 
-__all__ = ["RequestLoggingMiddleware"]
+class PathAliasMiddleware:
+    """
+    Pure ASGI middleware that rewrites aliased request paths to their canonical route.
+
+    Keeps legacy spellings working with a single dict lookup per request instead
+    of registering each alias as a separate route with its own dependency graph.
+    """
+
+    def __init__(self, app: ASGIApp, aliases: Mapping[str, str]) -> None:
+        self.app = app
+        self._aliases = dict(aliases)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            target = self._aliases.get(scope["path"])
+            if target is not None:
+                scope = {**scope, "path": target, "raw_path": target.encode("latin-1")}
+        await self.app(scope, receive, send)
+
+
+__all__ = ["PathAliasMiddleware", "RequestObservabilityMiddleware"]
@@ -8,20 +8,31 @@ from slowapi.util import get_remote_address
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.core.rate_limit_fast import FixedWindowLimiter, FixedWindowRateLimitMiddleware
 
 logger = get_logger(__name__)
-settings = get_settings()
 
-limiter = Limiter(key_func=get_remote_address)
+RATE_LIMIT_BACKEND_SLOWAPI = "slowapi"
+MEMORY_STORAGE_URI = "memory://"
+
+# Storage is chosen once at import; the helpers below re-read settings on each call.
+limiter = Limiter(key_func=get_remote_address, storage_uri=get_settings().redis_url or MEMORY_STORAGE_URI)
+
+
+def _uses_slowapi() -> bool:
+    """SlowAPI handles limiting when selected explicitly or when shared storage is configured."""
+    settings = get_settings()
+    return settings.rate_limit_backend == RATE_LIMIT_BACKEND_SLOWAPI or bool(settings.redis_url)
 
 
 def get_rate_limit_decorator(calls_per_minute: int | None = None):
     """
     Return a SlowAPI limit decorator honoring RATE_LIMIT_ENABLED.
-    When rate limiting is disabled, this returns a no-op decorator.
+    When rate limiting is disabled, or the fixed-window middleware already
+    limits every route, this returns a no-op decorator.
     """
-
-    if not settings.rate_limit_enabled:
+    settings = get_settings()
+    if not settings.rate_limit_enabled or not _uses_slowapi():
         def _noop(func):
             return func
 
@@ -33,15 +44,32 @@ def get_rate_limit_decorator(calls_per_minute: int | None = None):
 
 def setup_rate_limiting(app: FastAPI) -> None:
     """
-    Configure rate limiting for the FastAPI app using SlowAPI.
-    
-    Sets up SlowAPI limiter, middleware, and exception handler.
+    Configure rate limiting for the FastAPI app.
+
+    By default installs the fixed-window per-IP middleware; with
+    RATE_LIMIT_BACKEND=slowapi, or when REDIS_URL is set, sets up the SlowAPI
+    limiter, middleware, and exception handler instead. With REDIS_URL the
+    counters live in Redis, so they are shared by all workers and survive restarts.
     Respects RATE_LIMIT_ENABLED and RATE_LIMIT_PER_MINUTE settings.
     """
+    settings = get_settings()
     if not settings.rate_limit_enabled:
         logger.info("Rate limiting is disabled")
         return
-    
+
+    if not _uses_slowapi():
+        fast_limiter = FixedWindowLimiter(max_requests=settings.rate_limit_per_minute)
+        app.state.rate_limiter = fast_limiter
+        app.add_middleware(FixedWindowRateLimitMiddleware, limiter=fast_limiter)
+        logger.info(
+            "Rate limiting enabled",
+            extra={
+                "requests_per_minute": settings.rate_limit_per_minute,
+                "backend": "fixed_window",
+            },
+        )
+        return
+
     default_limit = f"{settings.rate_limit_per_minute}/minute"
     limiter.default_limits = [default_limit]
     
@@ -54,6 +82,7 @@ def setup_rate_limiting(app: FastAPI) -> None:
         extra={
             "requests_per_minute": settings.rate_limit_per_minute,
             "default_limit": default_limit,
+            "storage": "redis" if settings.redis_url else "memory",
         },
     )
 
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Number of (client, window) counters kept before stale windows are purged.
+MAX_TRACKED_KEYS = 4096
+
+
+class FixedWindowLimiter:
+    """
+    Per-client fixed-window request counter.
+
+    Each client gets `max_requests` per `window_seconds` window aligned to the
+    epoch. A hit is one dict lookup and store, with no limit-string parsing or
+    datetime math.
+    """
+
+    def __init__(self, max_requests: int, window_seconds: int = 60) -> None:
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._counts: dict[tuple[str, int], int] = {}
+
+    def hit(self, client_id: str) -> bool:
+        """Count a request for `client_id`; return False once it is over the limit."""
+        window = int(time.time()) // self.window_seconds
+        key = (client_id, window)
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        if len(self._counts) > MAX_TRACKED_KEYS:
+            self._purge(window)
+        return count <= self.max_requests
+
+    def retry_after(self) -> int:
+        """Seconds until the current window resets."""
+        return self.window_seconds - int(time.time()) % self.window_seconds
+
+    def _purge(self, current_window: int) -> None:
+        self._counts = {key: count for key, count in self._counts.items() if key[1] >= current_window}
+
+    def reset(self) -> None:
+        self._counts.clear()
+
+
+class FixedWindowRateLimitMiddleware:
+    """
+    Pure ASGI middleware applying a `FixedWindowLimiter` per client IP.
+
+    Rejected requests get a 429 with the same body shape as SlowAPI's handler
+    and a Retry-After header.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: FixedWindowLimiter) -> None:
+        self.app = app
+        self.limiter = limiter
+        self._body = orjson.dumps(
+            {"error": f"Rate limit exceeded: {limiter.max_requests} per {limiter.window_seconds} second"}
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        if self.limiter.hit(client[0] if client else "127.0.0.1"):
+            await self.app(scope, receive, send)
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(self._body)).encode("latin-1")),
+                    (b"retry-after", str(self.limiter.retry_after()).encode("latin-1")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": self._body})
+
+
+__all__ = ["FixedWindowLimiter", "FixedWindowRateLimitMiddleware"]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Drop-in for JSONResponse on paths that build plain dict/list content
+    (error handlers, static routes), skipping the stdlib json encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    Serialize an already-built response model straight to JSON bytes.
+
+    Returning a Response makes FastAPI skip re-validating the value against the
+    route's response_model, which is redundant for models the service layer has
+    just constructed from our own rows. The response_model is still used for
+    the OpenAPI schema.
+    """
+    return Response(
+        content=type(model).__pydantic_serializer__.to_json(model),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+__all__ = ["OrjsonResponse", "model_response"]
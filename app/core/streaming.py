@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Mapping
+from typing import Any
+
+import orjson
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.core.exceptions import _orjson_default
+
+
+def _encode_item(item: Any) -> bytes:
+    # Pydantic models go through their compiled serializer; everything else through orjson.
+    if isinstance(item, BaseModel):
+        return type(item).__pydantic_serializer__.to_json(item)
+    return orjson.dumps(item, default=_orjson_default)
+
+
+async def stream_json_array(items: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    """
+    Encode items from an async iterable as a JSON array, one element per chunk.
+
+    The first bytes go out as soon as the first item is available, and only the
+    current item is held in memory.
+    """
+    yield b"["
+    separator = b""
+    async for item in items:
+        yield separator + _encode_item(item)
+        separator = b","
+    yield b"]"
+
+
+async def stream_json_envelope(
+    array_key: str,
+    items: AsyncIterable[Any],
+    tail: Callable[[], Mapping[str, Any]],
+) -> AsyncIterator[bytes]:
+    """
+    Encode `{"<array_key>": [...items], **tail()}` incrementally.
+
+    `tail` is called after the last item, so summary fields that are only known
+    once every item has been produced (counts, timings) can still be included.
+    """
+    yield b"{" + orjson.dumps(array_key) + b":"
+    async for chunk in stream_json_array(items):
+        yield chunk
+    for key, value in tail().items():
+        yield b"," + orjson.dumps(key) + b":" + _encode_item(value)
+    yield b"}"
+
+
+def json_array_response(items: AsyncIterable[Any]) -> StreamingResponse:
+    """Wrap an async iterable in a streaming application/json array response."""
+    return StreamingResponse(stream_json_array(items), media_type="application/json")
+
+
+__all__ = ["json_array_response", "stream_json_array", "stream_json_envelope"]
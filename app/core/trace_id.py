@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import os
+import threading
+
+# Random bytes drawn per os.urandom call; each trace id consumes 16 of them.
+_POOL_SIZE = 4096
+_ID_BYTES = 16
+
+_local = threading.local()
+
+
+def _refill() -> None:
+    _local.pool = os.urandom(_POOL_SIZE)
+    _local.offset = 0
+
+
+def new_trace_id() -> str:
+    """
+    Return a random UUID-formatted trace id.
+
+    Ids are sliced from a per-thread pool of random bytes, so only one in every
+    256 calls hits the os.urandom syscall. They are for log correlation only and
+    don't set RFC 4122 version/variant bits.
+    """
+    offset = getattr(_local, "offset", _POOL_SIZE)
+    if offset + _ID_BYTES > _POOL_SIZE:
+        _refill()
+        offset = 0
+    _local.offset = offset + _ID_BYTES
+    h = _local.pool[offset : offset + _ID_BYTES].hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+__all__ = ["new_trace_id"]
@@ -1,11 +1,50 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+
+import httpx
 from fastapi import Depends
-from functools import lru_cache
-from app.core.config import settings
-from supabase import Client, create_client
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from supabase import AsyncClient, AsyncClientOptions, Client, acreate_client, create_client
+
+logger = get_logger(__name__)
+
+# Clients are created on first use and then returned directly; the lock only guards creation.
+_client: Client | None = None
+_service_role_client: Client | None = None
+_client_lock = threading.Lock()
+
+# Async anon client for the per-request auth path, awaited on the event loop
+# instead of occupying a worker thread per call.
+ASYNC_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+ASYNC_HTTP_TIMEOUT = httpx.Timeout(30.0)
+_async_client: AsyncClient | None = None
+_async_client_lock = asyncio.Lock()
+
+
+def validate_supabase_env(*, require_service_role: bool = False) -> None:
+    """
+    Check the Supabase settings the client factories rely on.
+
+    Called once from the app lifespan so a misconfigured deployment fails at
+    startup rather than on its first request.
+
+    Raises:
+        ValueError: If required environment variables are not set
+    """
+    settings = get_settings()
+    if not settings.supabase_url or not settings.supabase_anon_key:
+        raise ValueError(
+            "Supabase URL and ANON_KEY must be set in environment variables"
+        )
+    if require_service_role and not settings.supabase_service_role_key:
+        raise ValueError(
+            "Supabase URL and SERVICE_ROLE_KEY must be set in environment variables"
+        )
+
 
-@lru_cache()
 def get_supabase_client() -> Client:
     """
     FastAPI dependency to create and return a Supabase client instance.
@@ -15,19 +54,16 @@ def get_supabase_client() -> Client:
     
     Returns:
         Client: Supabase client configured with anon key
-        
-    Raises:
-        ValueError: If required environment variables are not set
     """
-    if not settings.supabase_url or not settings.supabase_anon_key:
-        raise ValueError(
-            "Supabase URL and ANON_KEY must be set in environment variables"
-        )
-    
-    return create_client(settings.supabase_url, settings.supabase_anon_key)
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                settings = get_settings()
+                _client = create_client(settings.supabase_url, settings.supabase_anon_key)
+    return _client
 
 
-@lru_cache()
 def get_supabase_service_role_client() -> Client:
     """
     FastAPI dependency to create and return a Supabase service role client instance.
@@ -37,16 +73,83 @@ def get_supabase_service_role_client() -> Client:
     
     Returns:
         Client: Supabase client configured with service role key
-        
-    Raises:
-        ValueError: If required environment variables are not set
     """
-    if not settings.supabase_url or not settings.supabase_service_role_key:
-        raise ValueError(
-            "Supabase URL and SERVICE_ROLE_KEY must be set in environment variables"
+    global _service_role_client
+    if _service_role_client is None:
+        with _client_lock:
+            if _service_role_client is None:
+                settings = get_settings()
+                _service_role_client = create_client(settings.supabase_url, settings.supabase_service_role_key)
+    return _service_role_client
+
+
+async def get_supabase_async_client() -> AsyncClient:
+    """
+    FastAPI dependency returning the shared async Supabase client (anon key).
+
+    Requests go through one pooled httpx.AsyncClient so concurrency is bounded
+    by ASYNC_HTTP_LIMITS rather than the AnyIO worker thread pool.
+
+    Returns:
+        AsyncClient: Supabase async client configured with anon key
+    """
+    global _async_client
+    if _async_client is None:
+        async with _async_client_lock:
+            if _async_client is None:
+                settings = get_settings()
+                _async_client = await acreate_client(
+                    settings.supabase_url,
+                    settings.supabase_anon_key,
+                    options=AsyncClientOptions(
+                        auto_refresh_token=False,
+                        persist_session=False,
+                        httpx_client=httpx.AsyncClient(
+                            limits=ASYNC_HTTP_LIMITS,
+                            timeout=ASYNC_HTTP_TIMEOUT,
+                            follow_redirects=True,
+                        ),
+                    ),
+                )
+    return _async_client
+
+
+async def warm_supabase_async_client(connections: int) -> None:
+    """
+    Open keep-alive connections on the async client's pool before traffic arrives.
+
+    Issues ``connections`` concurrent one-row reads so each leaves a warm TLS
+    connection in the pool. Failures are logged and otherwise ignored.
+    """
+    if connections <= 0:
+        return
+    try:
+        client = await get_supabase_async_client()
+        await asyncio.gather(
+            *(
+                client.table("household_members").select("user_id").limit(1).execute()
+                for _ in range(min(connections, ASYNC_HTTP_LIMITS.max_keepalive_connections))
+            )
         )
-    
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+    except Exception:
+        logger.warning("Supabase connection warmup failed", exc_info=True)
+        return
+    logger.info("Supabase connection pool warmed", extra={"connections": connections})
+
+
+async def close_supabase_async_client() -> None:
+    """Close the async client's connection pool; called from the app lifespan on shutdown."""
+    global _async_client
+    client, _async_client = _async_client, None
+    if client is not None and client.options.httpx_client is not None:
+        await client.options.httpx_client.aclose()
 
 
-__all__ = ["get_supabase_client", "get_supabase_service_role_client"]
\ No newline at end of file
+__all__ = [
+    "close_supabase_async_client",
+    "get_supabase_async_client",
+    "get_supabase_client",
+    "get_supabase_service_role_client",
+    "validate_supabase_env",
+    "warm_supabase_async_client",
+]
\ No newline at end of file
@@ -1,22 +1,50 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 from contextlib import asynccontextmanager
 from typing import Any
 
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Response
 
 from app.core.cache import get_cache
-from app.core.config import get_settings
+from app.core.config import get_settings, parse_hot_queries
 from app.core.exceptions import AppError, app_error_handler, setup_exception_handlers
 from app.core.logging import configure_logging
-from app.core.middleware import RequestLoggingMiddleware
+from app.core.middleware import PathAliasMiddleware, RequestObservabilityMiddleware
 from app.core.rate_limit import setup_rate_limiting
+from app.core.responses import OrjsonResponse
+from app.deps.supabase import close_supabase_async_client, validate_supabase_env, warm_supabase_async_client
 from app.routers import health_router, household_router, pantry_router
+from app.routers.pantry import LEGACY_PATH_ALIASES
 
 logger = logging.getLogger(__name__)
 
+_ROOT_BODY = b'{"status":"ok"}'
+
+
+def _start_retriever_warmup(settings: Any) -> asyncio.Task[None] | None:
+    """Prefetch configured hot retrieval queries in the background so startup isn't blocked."""
+    pairs = parse_hot_queries(
+        getattr(settings, "retriever_hot_queries", []),
+        getattr(settings, "retriever_warmup_k", 5),
+    )
+    if not pairs:
+        return None
+    # Imported lazily: the retriever builds the vector store client at import time.
+    from app.ai.retriver import warmup_retriever_cache
+
+    return asyncio.create_task(warmup_retriever_cache(pairs))
+
+
+def _start_supabase_warmup(settings: Any) -> asyncio.Task[None] | None:
+    """Open warm connections to Supabase in the background so the first requests skip the TLS handshake."""
+    connections = getattr(settings, "supabase_warmup_connections", 0)
+    if connections <= 0:
+        return None
+    return asyncio.create_task(warm_supabase_async_client(connections))
+
 
 def create_app(*, settings: Any | None = None) -> FastAPI:
     resolved_settings = get_settings() if settings is None else settings
@@ -25,19 +53,31 @@ def create_app(*, settings: Any | None = None) -> FastAPI:
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         logger.info("Starting app", extra={"app_name": resolved_settings.app_name, "app_env": resolved_settings.app_env})
+        # Household routes use the service role client, so both keys are required.
+        validate_supabase_env(require_service_role=True)
+        warmup_tasks = [
+            task
+            for task in (_start_supabase_warmup(resolved_settings), _start_retriever_warmup(resolved_settings))
+            if task is not None
+        ]
         yield
         logger.info("Shutting down app")
+        for task in warmup_tasks:
+            if not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        await close_supabase_async_client()
         get_cache().clear()
 
-    app = FastAPI(title=resolved_settings.app_name, lifespan=lifespan)
-
-    app.add_middleware(RequestLoggingMiddleware)
+    app = FastAPI(
+        title=resolved_settings.app_name,
+        lifespan=lifespan,
+        default_response_class=OrjsonResponse,
+    )
 
-    @app.middleware("http")
-    async def request_timing_middleware(request: Request, call_next):
-        response = await call_next(request)
-        response.headers["x-app-name"] = resolved_settings.app_name
-        return response
+    app.add_middleware(PathAliasMiddleware, aliases=LEGACY_PATH_ALIASES)
+    app.add_middleware(RequestObservabilityMiddleware, app_name=resolved_settings.app_name)
 
     setup_exception_handlers(app)
     app.add_exception_handler(AppError, app_error_handler)
@@ -48,8 +88,8 @@ def create_app(*, settings: Any | None = None) -> FastAPI:
     app.include_router(pantry_router)
 
     @app.get("/", include_in_schema=False)
-    def get_root() -> JSONResponse:
-        return JSONResponse({"status": "ok"})
+    def get_root() -> Response:
+        return Response(content=_ROOT_BODY, media_type="application/json")
 
     return app
 
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DeferredModel(BaseModel):
+    """
+    BaseModel that builds its validator/serializer on first use instead of at import.
+
+    For schema modules that are imported at worker start but only exercised by
+    some requests (recipes, shopping lists, user preferences).
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+
+__all__ = ["DeferredModel"]
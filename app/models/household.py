@@ -1,9 +1,11 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
 from uuid import UUID
 
+from app.utils.date_time_styling import parse_iso_datetime
+
 class HouseholdBase(BaseModel):
     """Base household model"""
     name: str = Field(..., min_length=1, max_length=100)
@@ -26,8 +28,23 @@ class HouseholdResponse(HouseholdBase):
     is_personal: bool = False
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
+
+    @classmethod
+    def from_db(cls, row: Dict[str, Any]) -> "HouseholdResponse":
+        """
+        Build from a households row without running validators.
+
+        Trust boundary: only for rows read back from our own database. Never
+        pass client input here; use the normal constructor so it is validated.
+        """
+        return cls.model_construct(
+            id=UUID(str(row["id"])),
+            name=row["name"],
+            invite_code=row["invite_code"],
+            is_personal=row.get("is_personal", False),
+            created_at=parse_iso_datetime(value=row["created_at"]),
+        )
 
 class HouseholdMemberBase(BaseModel):
     """Base household member model"""
@@ -40,8 +57,7 @@ class HouseholdMemberResponse(HouseholdMemberBase):
     joined_at: datetime
     user_email: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 class HouseholdWithMembers(HouseholdResponse):
     """Household with member list"""
@@ -231,17 +231,8 @@ class PantryItemBulkCreate(BaseModel):
 
 class PantryItemsBulkCreateRequest(BaseModel):
     """Request to bulk create pantry items"""
-    items: List[PantryItemBulkCreate] = Field(..., min_items=1, max_items=100)
-    
-    @field_validator("items")
-    @classmethod
-    def validate_unique_names(cls, value: List[PantryItemBulkCreate]) -> List[PantryItemBulkCreate]:
-        """Warn if duplicate names (optional - can allow duplicates)"""
-        names = [item.name.lower() for item in value]
-        if len(names) != len(set(names)):
-            # Could raise error or just allow duplicates
-            pass
-        return value
+    # Duplicate names are allowed, so there is no list-level validator walking the items again.
+    items: List[PantryItemBulkCreate] = Field(..., min_length=1, max_length=100)
 
 class BulkUpsertResult(BaseModel):
     """Result for a single item in bulk operation"""
@@ -1,51 +1,50 @@
-from typing import List, Optional
+import sys
+from typing import Annotated, Any, Dict, List, Literal, NotRequired, Optional, Tuple, TypedDict, Union, get_args
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import ConfigDict, Field, TypeAdapter, field_serializer, field_validator, model_validator
 from datetime import datetime
 from uuid import UUID
-from enum import Enum
+
+from app.models.base import DeferredModel
+from app.utils.date_time_styling import format_epoch_seconds, parse_iso_datetime
 
 # -------------------------
-# Enum definitions
+# Tag types
 # -------------------------
+# Literal rather than str-Enum: validation is a set-membership check and values
+# are plain strings everywhere (requests, DB rows, prompts).
 
-class DietaryTag(str, Enum):
-    """
-    Dietary restriction tags for recipes, to filter or tag recipes according to specific diets or allergies.
-    """
-    VEGETARIAN = "vegetarian"
-    VEGAN = "vegan"
-    GLUTEN_FREE = "gluten_free"
-    DAIRY_FREE = "dairy_free"
-    NUT_FREE = "nut_free"
-    LOW_CARB = "low_carb"
-    KETO = "keto"
-    PALEO = "paleo"
-    HALAL = "halal"
-    KOSHER = "kosher"
-
-class Difficulty(str, Enum):
-    """
-    Levels of recipe difficulty to help users gauge required cooking proficiency.
-    """
-    EASY = "easy"
-    MEDIUM = "medium"
-    HARD = "hard"
+# Dietary restriction tags for recipes, to filter or tag recipes according to specific diets or allergies.
+DietaryTag = Literal[
+    "vegetarian",
+    "vegan",
+    "gluten_free",
+    "dairy_free",
+    "nut_free",
+    "low_carb",
+    "keto",
+    "paleo",
+    "halal",
+    "kosher",
+]
 
-class RecipeMode(str, Enum):
-    """
-    Represents how to source pantry items for recipe generation.
-    - PERSONAL: Only items owned by the requesting user.
-    - HOUSEHOLD: Includes all items in the shared household.
-    """
-    PERSONAL = "personal"    # Only use the user's own pantry items
-    HOUSEHOLD = "household"  # Include all household pantry items
+# Levels of recipe difficulty to help users gauge required cooking proficiency.
+Difficulty = Literal["easy", "medium", "hard"]
+
+# How to source pantry items for recipe generation:
+# - "personal": Only items owned by the requesting user.
+# - "household": Includes all items in the shared household.
+RecipeMode = Literal["personal", "household"]
+
+DIETARY_TAGS: Tuple[DietaryTag, ...] = get_args(DietaryTag)
+DIFFICULTIES: Tuple[Difficulty, ...] = get_args(Difficulty)
+RECIPE_MODES: Tuple[RecipeMode, ...] = get_args(RecipeMode)
 
 # -------------------------
 # Ingredient and Step Models
 # -------------------------
 
-class RecipeIngredient(BaseModel):
+class RecipeIngredient(DeferredModel):
     """
     Represents a single ingredient used in a recipe.
     
@@ -68,65 +67,169 @@ class RecipeIngredient(BaseModel):
     def validate_name(cls, value: str) -> str:
         """
         Ensure ingredient names are lowercase and stripped of whitespace for internal consistency.
+        Already-normalized names (the stored form) are returned without building new strings.
         """
+        if value.islower() and not value[0].isspace() and not value[-1].isspace():
+            return value
         return value.strip().lower()
 
-class RecipeStep(BaseModel):
+    @field_validator("unit", "owner", mode="before")
+    def intern_vocabulary(cls, value: Any) -> Any:
+        """
+        Intern the small, heavily repeated unit/owner vocabulary so equal values share one string object.
+        """
+        return sys.intern(value) if isinstance(value, str) else value
+
+class RecipeIngredientDict(TypedDict):
+    """
+    Plain-dict shape of RecipeIngredient for internal bulk transfer (LLM output, JSON columns).
+
+    Lists of these are passed around without building a model per ingredient;
+    convert with `parse_ingredients` only at the API boundary.
+    """
+    name: str
+    quantity: str
+    unit: NotRequired[Optional[str]]
+    have: NotRequired[bool]
+    owner: NotRequired[Optional[str]]
+    pantry_item_id: NotRequired[Optional[str]]
+
+# Built once; reused for every JSON ingredients column we hydrate.
+_INGREDIENTS_ADAPTER: TypeAdapter[List[RecipeIngredient]] = TypeAdapter(List[RecipeIngredient], config=ConfigDict(defer_build=True))
+
+
+def parse_ingredients(raw: List[RecipeIngredientDict]) -> List[RecipeIngredient]:
+    """
+    Validate a raw ingredients list (e.g. a JSON column) into RecipeIngredient models in one pass.
+    """
+    return _INGREDIENTS_ADAPTER.validate_python(raw)
+
+class RecipeStep(DeferredModel):
     """
     Represents a single step/instruction in a recipe.
     
     Fields:
+        - type: Union tag, always "step".
         - step_number: Sequential number for step ordering. Must be >=1.
         - instruction: The full step instruction text (10-500 chars).
     """
+    type: Literal["step"] = "step"
     step_number: int = Field(..., ge=1)
     instruction: str = Field(..., min_length=10, max_length=500)
 
+class PlainInstruction(DeferredModel):
+    """
+    A free-text instruction without step numbering.
+
+    Fields:
+        - type: Union tag, always "plain".
+        - text: The instruction text.
+    """
+    type: Literal["plain"] = "plain"
+    text: str = Field(..., min_length=1)
+
+# Tagged on `type`, so validation goes straight to the matching model instead of trying each arm.
+Instruction = Annotated[Union[RecipeStep, PlainInstruction], Field(discriminator="type")]
+
+_INSTRUCTIONS_ADAPTER: TypeAdapter[List[Instruction]] = TypeAdapter(List[Instruction], config=ConfigDict(defer_build=True))
+
+
+def _wrap_plain_instructions(raw: Any) -> Any:
+    # Bare strings (older clients, existing rows) become PlainInstruction payloads.
+    if isinstance(raw, list):
+        return [{"type": "plain", "text": item} if isinstance(item, str) else item for item in raw]
+    return raw
+
+
+def parse_instructions(raw: List[Any]) -> List[Instruction]:
+    """
+    Validate a raw instructions list (e.g. a JSON column) into RecipeStep/PlainInstruction models in one pass.
+    """
+    return _INSTRUCTIONS_ADAPTER.validate_python(_wrap_plain_instructions(raw))
+
 # -------------------------
 # Base Recipe Structure
 # -------------------------
 
-class RecipeBase(BaseModel):
+class RecipeCore(DeferredModel):
     """
-    Base model defining all the core attributes for a recipe.
+    Recipe fields without length/range constraints.
+
+    Used directly by RecipeResponse, whose data comes from our own rows and was
+    checked on the way in; see RecipeBase for the constrained input version.
     
     Fields:
-        - title: The recipe's title (display name). Required.
+        - title: The recipe's title (display name).
         - description: Optional, rich text or summary of the recipe.
-        - ingredients: List of RecipeIngredient objects (at least 1).
-        - instructions: List of instructions (strings, can be detailed steps).
-        - prep_time: Preparation time in minutes (0-480).
-        - cook_time: Cooking time in minutes (0-480).
-        - servings: Number of servings (1-50).
+        - ingredients: List of RecipeIngredient objects.
+        - instructions: List of instructions, each a RecipeStep or PlainInstruction (bare strings are accepted as plain).
+        - prep_time: Preparation time in minutes.
+        - cook_time: Cooking time in minutes.
+        - servings: Number of servings.
         - difficulty: Optional difficulty level ("easy", "medium", "hard").
         - cuisine: Optional, describes type/culture (e.g. "Italian").
-        - dietary_tags: DietaryTag enums for user filtering (e.g. vegan, nut_free).
+        - dietary_tags: DietaryTag values for user filtering (e.g. vegan, nut_free).
+        - total_time: prep_time + cook_time, set once at construction.
+    """
+    title: str
+    description: Optional[str] = None
+    ingredients: List[RecipeIngredient]
+    instructions: List[Instruction]
+    prep_time: int
+    cook_time: int
+    servings: int
+    difficulty: Optional[Difficulty] = "medium"
+    cuisine: Optional[str] = None
+    dietary_tags: List[DietaryTag] = Field(default_factory=list)
+    total_time: int = 0
+
+    @field_validator("instructions", mode="before")
+    def wrap_plain_instructions(cls, value: Any) -> Any:
+        """
+        Accept bare strings as plain instructions so existing payloads keep validating.
+        """
+        return _wrap_plain_instructions(value)
+
+    @model_validator(mode="after")
+    def set_total_time(self) -> "RecipeCore":
+        """
+        Store total recipe time in minutes (prep + cook) so it serializes as a plain field.
+        """
+        # Bypasses the frozen check on RecipeResponse; this only runs during construction.
+        object.__setattr__(self, "total_time", self.prep_time + self.cook_time)
+        return self
+
+class RecipeBase(RecipeCore):
+    """
+    RecipeCore plus the input constraints, for client-supplied recipes.
+    
+    Constraints:
+        - title: Required, 1-200 chars, normalized to title case.
+        - description: Up to 500 chars.
+        - ingredients / instructions: At least 1 each.
+        - prep_time / cook_time: 0-480 minutes.
+        - servings: 1-50.
+        - cuisine: Up to 50 chars.
     """
     title: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=500)
-    ingredients: List[RecipeIngredient] = Field(..., min_items=1)
-    instructions: List[str] = Field(..., min_items=1)  # Each item is a string instruction, optionally use RecipeStep.
+    ingredients: List[RecipeIngredient] = Field(..., min_length=1)
+    instructions: List[Instruction] = Field(..., min_length=1)
     prep_time: int = Field(..., ge=0, le=480)
     cook_time: int = Field(..., ge=0, le=480)
     servings: int = Field(..., ge=1, le=50)
-    difficulty: Optional[Difficulty] = Difficulty.MEDIUM
     cuisine: Optional[str] = Field(None, max_length=50)
-    dietary_tags: List[DietaryTag] = Field(default_factory=list)
 
     @field_validator("title")
     def validate_title(cls, value: str) -> str:
         """
         Cleanup and standardize recipe titles to title case.
+        Already-normalized titles (the stored form) are returned without building new strings.
         """
+        if value.istitle() and not value[0].isspace() and not value[-1].isspace():
+            return value
         return value.strip().title()
 
-    @property
-    def total_time(self) -> int:
-        """
-        Computed property for total recipe time in minutes (prep + cook).
-        """
-        return self.prep_time + self.cook_time
-
 # -------------------------
 # Subclasses & Responses
 # -------------------------
@@ -138,7 +241,7 @@ class RecipeCreate(RecipeBase):
     """
     pass
 
-class RecipeResponse(RecipeBase):
+class RecipeResponse(RecipeCore):
     """
     Complete model for returning recipe metadata via API, including DB fields and computed fields.
     
@@ -147,7 +250,7 @@ class RecipeResponse(RecipeBase):
         - external_id: Optional, for 3rd-party recipes.
         - image_url: Optional image (URL or link).
         - source_url: Link to source if copied.
-        - created_at: When recipe was created.
+        - created_at: When recipe was created (JSON: Unix epoch seconds).
         - ingredients_available: Number of required ingredients currently in the user's pantry/household.
         - ingredients_needed: Number of ingredients missing/not found in pantry.
         - can_make: True if all required ingredients are available.
@@ -164,20 +267,44 @@ class RecipeResponse(RecipeBase):
     ingredients_needed: int = 0        # Count of ingredients not available/missing
     can_make: bool = False             # True if ingredients_needed == 0
 
-    class Config:
-        from_attributes = True         # Enables ORM serialization (e.g., SQLAlchemy obj → model)
-        use_enum_values = True         # Output enum values (str) instead of enum objects
+    @field_serializer("created_at", when_used="json")
+    def serialize_created_at(self, value: datetime) -> int:
+        """
+        Emit timestamps as epoch seconds in JSON: smaller than ISO strings and cheaper to encode.
+        """
+        return format_epoch_seconds(value=value)
+
+    # Immutable DTO; from_attributes enables ORM serialization (e.g., SQLAlchemy obj → model).
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
+
+    @classmethod
+    def from_db(cls, row: Dict[str, Any]) -> "RecipeResponse":
+        """
+        Build from a recipes row without running the field validators.
+
+        Trust boundary: only for rows read back from our own database, which were
+        validated on the way in. Client or LLM output must go through the normal
+        constructor. The JSON ingredients column is still parsed into models.
+        """
+        data = dict(row)
+        data["id"] = UUID(str(row["id"]))
+        data["created_at"] = parse_iso_datetime(value=row["created_at"])
+        data["ingredients"] = parse_ingredients(row.get("ingredients") or [])
+        data["instructions"] = parse_instructions(row.get("instructions") or [])
+        if data.get("total_time") is None:
+            data["total_time"] = row["prep_time"] + row["cook_time"]
+        return cls.model_construct(**data)
 
 # -------------------------
 # Recipe Generation Request/Response
 # -------------------------
 
-class RecipeGenerateRequest(BaseModel):
+class RecipeGenerateRequest(DeferredModel):
     """
     Request payload for generating new recipes via AI or algorithm.
     
     Fields:
-        - mode: Whether to use PERSONAL or HOUSEHOLD inventory (see RecipeMode).
+        - mode: Whether to use "personal" or "household" inventory (see RecipeMode).
         - dietary_preferences: Which dietary tags must be applied to generated recipes.
         - max_items_to_use: Max number of pantry items to use in each recipe (5-30, default 15).
         - cuisine: Optionally specify desired cuisine for recipe generation.
@@ -185,7 +312,7 @@ class RecipeGenerateRequest(BaseModel):
         - difficulty: If set, restrict generated recipes to given difficulty.
         - num_recipes: Number of recipes to return (1-5, default 3).
     """
-    mode: RecipeMode = RecipeMode.PERSONAL
+    mode: RecipeMode = "personal"
     dietary_preferences: List[DietaryTag] = Field(default_factory=list)
     max_items_to_use: int = Field(default=15, ge=5, le=30)
     cuisine: Optional[str] = Field(None, max_length=50)
@@ -193,13 +320,13 @@ class RecipeGenerateRequest(BaseModel):
     difficulty: Optional[Difficulty] = None
     num_recipes: int = Field(default=3, ge=1, le=5)
 
-class RecipeGenerateResponse(BaseModel):
+class RecipeGenerateResponse(DeferredModel):
     """
     Response payload after generating recipes.
     
     Fields:
         - recipes: List of generated RecipeResponse objects.
-        - mode: Which mode was used (PERSONAL or HOUSEHOLD).
+        - mode: Which mode was used ("personal" or "household").
         - pantry_items_used: Total number of pantry items used for generation.
         - generation_time: Time taken in seconds for the generation process.
         - tokens_used: (Optional) Number of AI/LLM tokens used if relevant.
@@ -214,18 +341,18 @@ class RecipeGenerateResponse(BaseModel):
 # Marking Ingredients Used
 # -------------------------
 
-class RecipeUseIngredientsRequest(BaseModel):
+class RecipeUseIngredientsRequest(DeferredModel):
     """
     Request payload to mark specified ingredients as 'used', to update pantry after cooking.
     
     Fields:
         - recipe_id: UUID of the relevant recipe.
-        - ingredient_indices: List of index positions in the recipe's ingredient list to mark as used.
+        - ingredient_indices: Tuple of index positions in the recipe's ingredient list to mark as used (hashable, usable as a cache key).
     """
     recipe_id: UUID
-    ingredient_indices: List[int] = Field(..., min_items=1)
+    ingredient_indices: Tuple[int, ...] = Field(..., min_length=1)
 
-class RecipeUseIngredientsResponse(BaseModel):
+class RecipeUseIngredientsResponse(DeferredModel):
     """
     Response after marking ingredients as 'used', indicating what pantry items were depleted/removed.
     
@@ -234,20 +361,21 @@ class RecipeUseIngredientsResponse(BaseModel):
         - deleted_items: UUIDs for pantry items that were removed from pantry (quantity zeroed/depleted).
         - message: User-friendly explanation of the action/results.
     """
-    updated_items: List[UUID] = Field(default_factory=list)
-    deleted_items: List[UUID] = Field(default_factory=list)
+    updated_items: Tuple[UUID, ...] = ()
+    deleted_items: Tuple[UUID, ...] = ()
     message: str
 
 # -------------------------
 # Recipe Search Model
 # -------------------------
 
-class RecipeSearchRequest(BaseModel):
+class RecipeSearchRequest(DeferredModel):
     """
     Request payload for searching (filtering) recipes by user criteria.
     
     Fields:
-        - query: User search string (name, keyword, etc.). Required.
+        - query: User search string (name, keyword, etc.). Required. Stripped and lowercased;
+          matched with plainto_tsquery against the recipes.tsv column.
         - dietary_preferences: List of dietary tags to filter by.
         - max_prep_time: (Optional) Return recipes ≤ this prep time (minutes).
         - difficulty: (Optional) Only return recipes of specified difficulty.
@@ -257,4 +385,13 @@ class RecipeSearchRequest(BaseModel):
     dietary_preferences: List[DietaryTag] = Field(default_factory=list)
     max_prep_time: Optional[int] = Field(None, ge=5, le=120)
     difficulty: Optional[Difficulty] = None
-    limit: int = Field(default=10, ge=1, le=50)
\ No newline at end of file
+    limit: int = Field(default=10, ge=1, le=50)
+
+    @field_validator("query", mode="before")
+    def normalize_query(cls, value: Any) -> Any:
+        """
+        Strip and lowercase the search text; tokenizing is left to Postgres.
+        """
+        if isinstance(value, str):
+            return value.strip().lower()
+        return value
\ No newline at end of file
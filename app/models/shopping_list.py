@@ -1,12 +1,28 @@
-from typing import List, Optional
+import sys
+from typing import Any, Dict, List, Literal, NotRequired, Optional, Tuple, TypedDict, get_args
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import ConfigDict, Field, TypeAdapter, field_serializer, field_validator
 from datetime import datetime
 from uuid import UUID
-from enum import Enum
 
-class ShoppingListItemBase(BaseModel):
-    """Base shopping list item"""
+from app.models.base import DeferredModel
+from app.utils.date_time_styling import format_epoch_seconds, parse_iso_datetime
+
+class ShoppingListItemCore(DeferredModel):
+    """Shopping list item fields without constraints, for items read back from our own rows"""
+    name: str
+    quantity: float = 1.0
+    unit: Optional[str] = None
+    category: Optional[str] = None
+    notes: Optional[str] = None
+
+    @field_validator("unit", "category", mode="before")
+    def intern_vocabulary(cls, value: Any) -> Any:
+        # Units and categories come from a small vocabulary repeated across many items.
+        return sys.intern(value) if isinstance(value, str) else value
+
+class ShoppingListItemBase(ShoppingListItemCore):
+    """Base shopping list item, with input constraints"""
     name: str = Field(..., min_length=1, max_length=100)
     quantity: float = Field(default=1.0, gt=0, le=1000)
     unit: Optional[str] = Field(None, max_length=20)
@@ -15,13 +31,16 @@ class ShoppingListItemBase(BaseModel):
 
     @field_validator("name")
     def validate_name(cls, value: str) -> str:
+        # Stored names are already title-cased and trimmed; skip rebuilding them.
+        if value.istitle() and not value[0].isspace() and not value[-1].isspace():
+            return value
         return value.strip().title()
 
 class ShoppingListItemCreate(ShoppingListItemBase):
     """Model for creating shopping list item"""
     pass
 
-class ShoppingListItemUpdate(BaseModel):
+class ShoppingListItemUpdate(DeferredModel):
     """Model for updating shopping list item"""
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     quantity: Optional[float] = Field(None, gt=0, le=1000)
@@ -30,14 +49,39 @@ class ShoppingListItemUpdate(BaseModel):
     notes: Optional[str] = Field(None, max_length=200)
     purchased: Optional[bool] = None
 
-class ShoppingListItem(ShoppingListItemBase):
+class ShoppingListItem(ShoppingListItemCore):
     """Shopping list item with metadata"""
     purchased: bool = False
     purchased_at: Optional[datetime] = None
     reason: Optional[str] = None  # "running_low", "expiring", "recipe", "manual"
     estimated_price: Optional[float] = None
 
-class ShoppingListBase(BaseModel):
+    @field_serializer("purchased_at", when_used="json")
+    def serialize_purchased_at(self, value: Optional[datetime]) -> Optional[int]:
+        # JSON timestamps are epoch seconds, matching the other response models.
+        return format_epoch_seconds(value=value) if value is not None else None
+
+class ShoppingListItemDict(TypedDict):
+    """Plain-dict shape of ShoppingListItem for internal bulk transfer; convert with `parse_items` at the API boundary."""
+    name: str
+    quantity: NotRequired[float]
+    unit: NotRequired[Optional[str]]
+    category: NotRequired[Optional[str]]
+    notes: NotRequired[Optional[str]]
+    purchased: NotRequired[bool]
+    purchased_at: NotRequired[Optional[str]]
+    reason: NotRequired[Optional[str]]
+    estimated_price: NotRequired[Optional[float]]
+
+# Built once; reused for every JSON items column we hydrate.
+_ITEMS_ADAPTER: TypeAdapter[List[ShoppingListItem]] = TypeAdapter(List[ShoppingListItem], config=ConfigDict(defer_build=True))
+
+
+def parse_items(raw: List[ShoppingListItemDict]) -> List[ShoppingListItem]:
+    """Validate a raw items list (e.g. a JSON column) into ShoppingListItem models in one pass."""
+    return _ITEMS_ADAPTER.validate_python(raw)
+
+class ShoppingListBase(DeferredModel):
     """Base shopping list model"""
     items: List[ShoppingListItem] = Field(default_factory=list)
 
@@ -53,35 +97,60 @@ class ShoppingListResponse(ShoppingListBase):
     purchased_items: int = 0
     pending_items: int = 0
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
+
+    @field_serializer("generated_at", "updated_at", when_used="json")
+    def serialize_timestamps(self, value: datetime) -> int:
+        # JSON timestamps are epoch seconds: smaller than ISO strings and cheaper to encode.
+        return format_epoch_seconds(value=value)
+
+    @classmethod
+    def from_db(cls, row: Dict[str, Any]) -> "ShoppingListResponse":
+        """
+        Build from a shopping_lists row without running validators.
+
+        Trust boundary: only for rows read back from our own database. Never
+        pass client input here. The JSON items column is still parsed into models.
+        """
+        data = dict(row)
+        data["id"] = UUID(str(row["id"]))
+        data["user_id"] = UUID(str(row["user_id"]))
+        data["generated_at"] = parse_iso_datetime(value=row["generated_at"])
+        data["updated_at"] = parse_iso_datetime(value=row["updated_at"])
+        items = parse_items(row.get("items") or [])
+        data["items"] = items
+        if data.get("total_items") is None:
+            # Counts are derived once here rather than on every read of the response.
+            purchased = sum(1 for item in items if item.purchased)
+            data["total_items"] = len(items)
+            data["purchased_items"] = purchased
+            data["pending_items"] = len(items) - purchased
+        return cls.model_construct(**data)
 
-class ShoppingListGenerateRequest(BaseModel):
+class ShoppingListGenerateRequest(DeferredModel):
     """Request to generate shopping list"""
     include_low_stock: bool = True
     include_expiring: bool = True
     include_staples: bool = True
     max_items: int = Field(default=20, ge=5, le=50)
 
-class ShoppingListMarkPurchasedRequest(BaseModel):
+class ShoppingListMarkPurchasedRequest(DeferredModel):
     """Request to mark items as purchased"""
-    item_indices: List[int] = Field(..., min_items=1)
+    item_indices: Tuple[int, ...] = Field(..., min_length=1)
     add_to_pantry: bool = True
 
-class ShoppingListMarkPurchasedResponse(BaseModel):
+class ShoppingListMarkPurchasedResponse(DeferredModel):
     """Response after marking items as purchased"""
     purchased_count: int
     added_to_pantry_count: int
-    pantry_item_ids: List[UUID] = Field(default_factory=list)
+    pantry_item_ids: Tuple[UUID, ...] = ()
     message: str
 
-class ShoppingListExportFormat(str, Enum):
-    """Export format options"""
-    TEXT = "text"
-    JSON = "json"
-    CSV = "csv"
+# Export format options
+ShoppingListExportFormat = Literal["text", "json", "csv"]
+SHOPPING_LIST_EXPORT_FORMATS: Tuple[ShoppingListExportFormat, ...] = get_args(ShoppingListExportFormat)
 
-class ShoppingListExportRequest(BaseModel):
+class ShoppingListExportRequest(DeferredModel):
     """Request to export shopping list"""
-    format: ShoppingListExportFormat = ShoppingListExportFormat.TEXT
+    format: ShoppingListExportFormat = "text"
     include_purchased: bool = False
\ No newline at end of file
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from app.models.base import DeferredModel
 
-class UserPreferencesBase(BaseModel):
+
+class UserPreferencesBase(DeferredModel):
     """
     Base model for user preferences.
     
@@ -43,7 +45,7 @@ class UserPreferences(UserPreferencesBase):
     pass
 
 
-class UserPreferencesUpdate(BaseModel):
+class UserPreferencesUpdate(DeferredModel):
     """
     Model for updating user preferences.
     
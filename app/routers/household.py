@@ -1,10 +1,11 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, Request
+from fastapi import APIRouter, Body, Depends, Request, Response
 from supabase import Client
 
 from app.core.logging import get_logger
 from app.core.rate_limit import get_rate_limit_decorator
+from app.core.responses import OrjsonResponse, model_response
 from app.deps.supabase import get_supabase_client, get_supabase_service_role_client
 from app.models.household import (
     HouseholdCreateRequest,
@@ -14,21 +15,50 @@ from app.models.household import (
     HouseholdLeaveResponse,
     HouseholdResponse,
 )
+from app.services import auth
 from app.services.auth import get_current_user_id
 from app.services.household_service import HouseholdService
 
 logger = get_logger(__name__)
-router: APIRouter = APIRouter(prefix="/households", tags=["households"])
+# Set on the router too so the orjson renderer applies even if it is mounted on another app.
+router: APIRouter = APIRouter(prefix="/households", tags=["households"], default_response_class=OrjsonResponse)
 rate_limit = get_rate_limit_decorator()
 
-def get_household_service(supabase: Client = Depends(get_supabase_client)) -> HouseholdService:
+def get_household_service(
+    supabase: Client = Depends(get_supabase_client),
+    supabase_admin: Client = Depends(get_supabase_service_role_client),
+) -> HouseholdService:
     """
     Dependency provider for HouseholdService.
-    Returns a HouseholdService instance using the provided Supabase client.
+    Returns a HouseholdService instance using the provided Supabase clients; both
+    are process-wide singletons, and the service is resolved once per request.
+    """
+    return HouseholdService(supabase, supabase_admin)
+
+
+@router.get("/current", response_model=HouseholdResponse)
+async def get_current_household(
+    *,
+    household: HouseholdResponse = Depends(auth.get_current_household),
+) -> Response:
+    """
+    Return the household the current user belongs to.
+
+    The household is resolved by the auth dependency with the same joined
+    membership query used for the household ID, so this endpoint costs no
+    extra round-trip. Results are cached per user and invalidated by the
+    create/join/leave/convert endpoints below.
+
+    Args:
+        household: The current user's household, injected via dependency.
+
+    Returns:
+        HouseholdResponse: The user's current household.
     """
-    return HouseholdService(supabase)
+    return model_response(household)
 
 
+@router.post("/create", response_model=HouseholdResponse)
 @rate_limit
 async def create_household(
     request: Request,
@@ -36,8 +66,7 @@ async def create_household(
     body: HouseholdCreateRequest,
     user_id: UUID = Depends(get_current_user_id),
     household_service: HouseholdService = Depends(get_household_service),
-    supabase_admin: Client = Depends(get_supabase_service_role_client),
-) -> HouseholdResponse:
+) -> Response:
     """
     Create a new household, making the current user the owner and member.
 
@@ -45,16 +74,16 @@ async def create_household(
         body: The data for household creation (name, etc.)
         user_id: The ID of the currently authenticated user (from auth dependency)
         household_service: Instance of HouseholdService, injected via dependency
-        supabase_admin: Service-role Supabase client (for privileged DB ops)
 
     Returns:
         HouseholdResponse: Metadata about the newly created household
     """
-    result = await household_service.create_household(body, user_id, supabase_admin=supabase_admin)
+    result = await household_service.create_household(body, user_id)
     logger.info("Household created", extra={"user_id": str(user_id), "household_id": str(result.id)})
-    return result
+    return model_response(result)
 
 
+@router.post("/join", response_model=HouseholdJoinResponse)
 @rate_limit
 async def join_household(
     request: Request,
@@ -62,8 +91,7 @@ async def join_household(
     body: HouseholdJoinRequest,
     user_id: UUID = Depends(get_current_user_id),
     household_service: HouseholdService = Depends(get_household_service),
-    supabase_admin: Client = Depends(get_supabase_service_role_client),
-) -> HouseholdJoinResponse:
+) -> Response:
     """
     Join a household using an invite code.
 
@@ -75,28 +103,23 @@ async def join_household(
         body: HouseholdJoinRequest containing the invite code.
         user_id: UUID of the currently authenticated user.
         household_service: HouseholdService instance injected.
-        supabase_admin: Service-role Supabase client.
 
     Returns:
         HouseholdJoinResponse: Details about the join operation.
     """
-    result = await household_service.join_household_by_invite(
-        body.invite_code,
-        user_id,
-        supabase_admin,
-    )
+    result = await household_service.join_household_by_invite(body.invite_code, user_id)
     logger.info("User joined household", extra={"user_id": str(user_id), "household_id": str(result.household.id), "items_moved": result.items_moved})
-    return result
+    return model_response(result)
 
 
+@router.post("/leave", response_model=HouseholdLeaveResponse)
 @rate_limit
 async def leave_household(
     request: Request,
     *,
     user_id: UUID = Depends(get_current_user_id),
     household_service: HouseholdService = Depends(get_household_service),
-    supabase_admin: Client = Depends(get_supabase_service_role_client),
-) -> HouseholdLeaveResponse:
+) -> Response:
     """
     Leave the user's current household and switch them to a new personal household.
 
@@ -107,16 +130,16 @@ async def leave_household(
     Args:
         user_id: UUID of current authenticated user.
         household_service: HouseholdService dependency.
-        supabase_admin: Admin client for database ops.
 
     Returns:
         HouseholdLeaveResponse: Info about items moved, new household, etc.
     """
-    result = await household_service.leave_household(user_id, supabase_admin)
+    result = await household_service.leave_household(user_id)
     logger.info("User left household", extra={"user_id": str(user_id), "new_household_id": str(result.new_household_id), "items_moved": result.items_deleted})
-    return result
+    return model_response(result)
 
 
+@router.post("/convert-to-joinable", response_model=HouseholdResponse)
 @rate_limit
 async def convert_to_joinable(
     request: Request,
@@ -124,8 +147,7 @@ async def convert_to_joinable(
     body: HouseholdConvertToJoinableRequest | None = Body(None),
     user_id: UUID = Depends(get_current_user_id),
     household_service: HouseholdService = Depends(get_household_service),
-    supabase_admin: Client = Depends(get_supabase_service_role_client),
-) -> HouseholdResponse:
+) -> Response:
     """
     Convert the user's personal household into a joinable (shared) household.
 
@@ -137,28 +159,19 @@ async def convert_to_joinable(
         body: HouseholdConvertToJoinableRequest with optional new name.
         user_id: UUID of the acting user (must be owner).
         household_service: HouseholdService instance.
-        supabase_admin: Admin client.
 
     Returns:
         HouseholdResponse: Details about the updated/joinable household.
     """
     name = body.name if body else None
-    result = await household_service.convert_personal_to_joinable(
-        user_id,
-        supabase_admin,
-        name=name,
-    )
+    result = await household_service.convert_personal_to_joinable(user_id, name=name)
     logger.info("Household converted to joinable", extra={"user_id": str(user_id), "household_id": str(result.id)})
-    return result
-
+    return model_response(result)
 
-router.post("/join", response_model=HouseholdJoinResponse)(join_household)
-router.post("/leave", response_model=HouseholdLeaveResponse)(leave_household)
-router.post("/create", response_model=HouseholdResponse)(create_household)
-router.post("/convert-to-joinable", response_model=HouseholdResponse)(convert_to_joinable)
 
 __all__ = [
     "router",
+    "get_current_household",
     "join_household",
     "leave_household",
     "convert_to_joinable",
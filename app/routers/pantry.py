@@ -1,12 +1,21 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import lru_cache
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Header, Request, Response, status
+from pydantic import TypeAdapter
 from supabase import Client
+import xxhash
 
 from app.core.cache import get_cache
 from app.core.exceptions import AppError
 from app.core.logging import get_logger
 from app.core.rate_limit import get_rate_limit_decorator
+from app.core.streaming import json_array_response
 from app.deps.supabase import get_supabase_client
 from app.models.pantry import (
     PantryItem,
@@ -18,49 +27,158 @@ from app.models.pantry import (
 from app.services.auth import get_current_household_id, get_current_user_id
 from app.services.pantry_service import PantryService
 
+# Log calls below are guarded so the str(UUID) and extra dicts are only built
+# when the level is enabled (isEnabledFor is cached by the logging module).
 logger = get_logger(__name__)
 router: APIRouter = APIRouter(prefix="/pantry", tags=["pantry"])
 rate_limit = get_rate_limit_decorator()
 
+# Stale-while-revalidate: entries are fresh for the soft TTL, then served stale
+# while one background task refreshes them, until the hard TTL drops them.
+PANTRY_CACHE_TTL_SECONDS = 60
+PANTRY_CACHE_HARD_TTL_SECONDS = 600
 
-def _invalidate_household_cache(household_id: UUID) -> None:
-    """Invalidate cache for household-scoped queries."""
-    cache = get_cache()
-    cache.delete(f"pantry:household:{household_id}")
 
+# Keys are memoized per UUID so cache hits skip both UUID.__str__ and formatting.
+@lru_cache(maxsize=8192)
+def _household_key(household_id: UUID) -> str:
+    return f"pantry:household:{household_id}"
 
-def _invalidate_user_cache(household_id: UUID, user_id: UUID) -> None:
-    """Invalidate cache for user-scoped queries."""
-    cache = get_cache()
-    cache.delete(f"pantry:user:{household_id}:{user_id}")
 
+def _invalidate_after_mutation(household_id: UUID) -> None:
+    """Invalidate the household's pantry cache; per-user views are derived from it."""
+    get_cache().delete(_household_key(household_id))
 
-def _get_cached_household_items(household_id: UUID) -> list[PantryItem] | None:
-    """Get cached household items or None if not cached."""
-    cache = get_cache()
-    cache_key = f"pantry:household:{household_id}"
-    return cache.get(cache_key)
 
+_PANTRY_ITEMS_ADAPTER = TypeAdapter(list[PantryItem])
+_EMPTY_ITEMS_BODY = b"[]"
 
-def _set_cached_household_items(household_id: UUID, items: list[PantryItem]) -> None:
-    """Cache household items with 60s TTL."""
-    cache = get_cache()
-    cache_key = f"pantry:household:{household_id}"
-    cache.set(cache_key, items, ttl_seconds=60)
 
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
 
-def _get_cached_user_items(household_id: UUID, user_id: UUID) -> list[PantryItem] | None:
-    """Get cached user items or None if not cached."""
-    cache = get_cache()
-    cache_key = f"pantry:user:{household_id}:{user_id}"
-    return cache.get(cache_key)
 
+def _etag(body: bytes) -> str:
+    return f'"{xxhash.xxh3_64_hexdigest(body)}"'
 
-def _set_cached_user_items(household_id: UUID, user_id: UUID, items: list[PantryItem]) -> None:
-    """Cache user items with 60s TTL."""
-    cache = get_cache()
-    cache_key = f"pantry:user:{household_id}:{user_id}"
-    cache.set(cache_key, items, ttl_seconds=60)
+
+def _etag_matches(etag: str, if_none_match: str | None) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix still matches.
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _items_response(body: bytes, etag: str, if_none_match: str | None) -> Response:
+    """Return the cached body with its ETag, or an empty 304 when the client already has it."""
+    headers = {"ETag": etag}
+    if _etag_matches(etag, if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _validated_items(rows: AsyncIterator[dict[str, Any]]) -> AsyncIterator[PantryItem]:
+    """Validate streamed rows so each element carries exactly the response model's fields."""
+    async for row in rows:
+        yield PantryItem.model_validate(row)
+
+
+class _PantrySnapshot:
+    """
+    A household's validated pantry items with their serialized JSON and ETag.
+
+    One snapshot per household is cached; each member's "my items" view is
+    filtered from it on first request and memoized on the snapshot, so a
+    refresh or invalidation replaces every view at once.
+    """
+
+    __slots__ = ("items", "body", "etag", "fetched_at", "_owner_views")
+
+    def __init__(self, rows: list[Any]) -> None:
+        # The service returns raw rows; validate them so bodies have exactly the response fields.
+        self.items = _PANTRY_ITEMS_ADAPTER.validate_python(rows)
+        self.body = _PANTRY_ITEMS_ADAPTER.dump_json(self.items)
+        self.etag = _etag(self.body)
+        self.fetched_at = time.monotonic()
+        self._owner_views: dict[UUID, tuple[bytes, str]] = {}
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.fetched_at > PANTRY_CACHE_TTL_SECONDS
+
+    def owner_view(self, user_id: UUID) -> tuple[bytes, str]:
+        """Return the JSON body and ETag for the items owned by user_id."""
+        view = self._owner_views.get(user_id)
+        if view is None:
+            body = _PANTRY_ITEMS_ADAPTER.dump_json([item for item in self.items if item.owner_id == user_id])
+            view = self._owner_views[user_id] = (body, _etag(body))
+        return view
+
+
+# Keys with a refresh in flight, and strong references to the refresh tasks.
+_refreshing_keys: set[str] = set()
+_refresh_tasks: set[asyncio.Task[None]] = set()
+
+
+def _store_snapshot(cache_key: str, rows: list[Any]) -> _PantrySnapshot:
+    snapshot = _PantrySnapshot(rows)
+    get_cache().set(cache_key, snapshot, ttl_seconds=PANTRY_CACHE_HARD_TTL_SECONDS)
+    return snapshot
+
+
+async def _refresh_snapshot(
+    cache_key: str,
+    stale: _PantrySnapshot,
+    load: Callable[[], Awaitable[list[Any] | None]],
+) -> None:
+    try:
+        rows = await load()
+        # Only replace the snapshot this refresh was started for; if a mutation invalidated the
+        # key (and maybe a newer load stored fresh rows) meanwhile, these rows are out of date.
+        if rows is not None and get_cache().get(cache_key) is stale:
+            _store_snapshot(cache_key, rows)
+    except Exception:
+        logger.warning("Background pantry cache refresh failed", extra={"cache_key": cache_key}, exc_info=True)
+    finally:
+        _refreshing_keys.discard(cache_key)
+
+
+def _schedule_refresh(
+    cache_key: str,
+    stale: _PantrySnapshot,
+    load: Callable[[], Awaitable[list[Any] | None]],
+) -> None:
+    """Start a background refresh for a stale snapshot unless one is already running for its key."""
+    if cache_key in _refreshing_keys:
+        return
+    _refreshing_keys.add(cache_key)
+    task = asyncio.create_task(_refresh_snapshot(cache_key, stale, load))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+async def _household_snapshot(household_id: UUID, pantry_service: PantryService) -> _PantrySnapshot | None:
+    """Return the household's cached pantry snapshot, loading it on a miss; None if the query returned nothing."""
+    cache_key = _household_key(household_id)
+    snapshot: _PantrySnapshot | None = get_cache().get(cache_key)
+    if snapshot is not None:
+        is_stale = snapshot.is_stale()
+        if is_stale:
+            _schedule_refresh(cache_key, snapshot, lambda: pantry_service.get_household_pantry_items(household_id))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Cache hit for household pantry items", extra={"household_id": str(household_id), "stale": is_stale})
+        return snapshot
+
+    rows = await pantry_service.get_household_pantry_items(household_id)
+    if rows is None:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Get household pantry items returned none", extra={"household_id": str(household_id)})
+        return None
+    snapshot = _store_snapshot(cache_key, rows)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Fetched household pantry items", extra={"household_id": str(household_id), "count": len(snapshot.items)})
+    return snapshot
 
 def get_pantry_service(supabase: Client = Depends(get_supabase_client)) -> PantryService:
     """
@@ -89,10 +207,10 @@ async def add_single_pantry_item(
         logger.error("Failed to add pantry item", extra={"household_id": str(household_id), "user_id": str(user_id)})
         raise AppError("Failed to add pantry item", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    _invalidate_household_cache(household_id)
-    _invalidate_user_cache(household_id, user_id)
+    _invalidate_after_mutation(household_id)
     
-    logger.info("Pantry item added", extra={"item_id": getattr(result, "id", None), "household_id": str(household_id)})
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Pantry item added", extra={"item_id": getattr(result, "id", None), "household_id": str(household_id)})
     return result
 
 @rate_limit
@@ -119,61 +237,59 @@ async def add_multiple_pantry_items(
         logger.error("Bulk pantry add failed", extra={"household_id": str(household_id), "count": len(pantry_items.items)})
         raise AppError("Bulk pantry add failed", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    _invalidate_household_cache(household_id)
-    _invalidate_user_cache(household_id, user_id)
+    _invalidate_after_mutation(household_id)
     
-    logger.info("Bulk pantry items added", extra={"household_id": str(household_id), "successful": result.successful})
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Bulk pantry items added", extra={"household_id": str(household_id), "successful": result.successful})
     return result
 
 async def get_all_pantry_items(
     *,
+    stream: bool = False,
+    if_none_match: str | None = Header(default=None),
     household_id: UUID = Depends(get_current_household_id),
     pantry_service: PantryService = Depends(get_pantry_service),
-) -> list[PantryItem]:
+) -> Response:
     """
     Fetch all pantry items belonging to the current user's household.
     - Returns an empty list if query fails or no items found.
-    - Results are cached for 60 seconds.
+    - Results are cached as serialized JSON, so hits skip pydantic entirely; after 60 seconds
+      the cached body is still served while a background task refreshes it.
+    - Responses carry an ETag; a matching If-None-Match gets an empty 304.
+    - With ?stream=true, rows are streamed page by page as a JSON array (uncached).
     """
-    cached_items = _get_cached_household_items(household_id)
-    if cached_items is not None:
-        logger.debug("Cache hit for household pantry items", extra={"household_id": str(household_id)})
-        return cached_items
-    
-    items = await pantry_service.get_household_pantry_items(household_id)
-    if items is None:
-        logger.info("Get household pantry items returned none", extra={"household_id": str(household_id)})
-        return []
-    
-    _set_cached_household_items(household_id, items)
-    logger.info("Fetched household pantry items", extra={"household_id": str(household_id), "count": len(items)})
-    return items
+    if stream:
+        return json_array_response(_validated_items(pantry_service.iter_pantry_items(household_id)))
+
+    snapshot = await _household_snapshot(household_id, pantry_service)
+    if snapshot is None:
+        return _json_response(_EMPTY_ITEMS_BODY)
+    return _items_response(snapshot.body, snapshot.etag, if_none_match)
 
 async def get_my_pantry_items(
     *,
+    stream: bool = False,
+    if_none_match: str | None = Header(default=None),
     user_id: UUID = Depends(get_current_user_id),
     household_id: UUID = Depends(get_current_household_id),
     pantry_service: PantryService = Depends(get_pantry_service),
-) -> list[PantryItem]:
+) -> Response:
     """
     Fetch pantry items for the current user in their household.
-    - Delegates to pantry_service method to scope by user.
+    - Filtered from the cached household snapshot, so it shares that cache entry and refresh.
     - Returns an empty list if none are found or operation fails.
-    - Results are cached for 60 seconds.
+    - The filtered body is serialized once per snapshot, so hits skip pydantic entirely.
+    - Responses carry an ETag; a matching If-None-Match gets an empty 304.
+    - With ?stream=true, rows are streamed page by page as a JSON array (uncached).
     """
-    cached_items = _get_cached_user_items(household_id, user_id)
-    if cached_items is not None:
-        logger.debug("Cache hit for user pantry items", extra={"household_id": str(household_id), "user_id": str(user_id)})
-        return cached_items
-    
-    items = await pantry_service.get_my_pantry_items(household_id, user_id)
-    if items is None:
-        logger.info("Get my pantry items returned none", extra={"household_id": str(household_id), "user_id": str(user_id)})
-        return []
-    
-    _set_cached_user_items(household_id, user_id, items)
-    logger.info("Fetched my pantry items", extra={"household_id": str(household_id), "user_id": str(user_id), "count": len(items)})
-    return items
+    if stream:
+        return json_array_response(_validated_items(pantry_service.iter_pantry_items(household_id, user_id)))
+
+    snapshot = await _household_snapshot(household_id, pantry_service)
+    if snapshot is None:
+        return _json_response(_EMPTY_ITEMS_BODY)
+    body, etag = snapshot.owner_view(user_id)
+    return _items_response(body, etag, if_none_match)
 
 @rate_limit
 async def update_pantry_item(
@@ -195,10 +311,10 @@ async def update_pantry_item(
         logger.error("Pantry item update failed (not found or forbidden)", extra={"household_id": str(household_id), "user_id": str(user_id)})
         raise AppError("Pantry item not found or could not be updated", status_code=status.HTTP_404_NOT_FOUND)
     
-    _invalidate_household_cache(household_id)
-    _invalidate_user_cache(household_id, user_id)
+    _invalidate_after_mutation(household_id)
     
-    logger.info("Pantry item updated", extra={"item_id": getattr(pantry_item, "id", None), "household_id": str(household_id)})
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Pantry item updated", extra={"item_id": getattr(pantry_item, "id", None), "household_id": str(household_id)})
     return result
 
 @rate_limit
@@ -220,74 +336,56 @@ async def delete_pantry_item(
         logger.error("Pantry item delete failed (not found)", extra={"item_id": str(item_id), "household_id": str(household_id)})
         raise AppError("Pantry item not found for deletion", status_code=status.HTTP_404_NOT_FOUND)
     
-    _invalidate_household_cache(household_id)
-    _invalidate_user_cache(household_id, user_id)
+    _invalidate_after_mutation(household_id)
     
-    logger.info("Pantry item deleted", extra={"item_id": str(item_id), "household_id": str(household_id)})
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Pantry item deleted", extra={"item_id": str(item_id), "household_id": str(household_id)})
     return result
 
 router.post(
     "/add-item",
     response_model=PantryItemUpsertResponse,
 )(add_single_pantry_item)
-router.post(
-    "/add_item",
-    response_model=PantryItemUpsertResponse,
-    include_in_schema=False,
-)(add_single_pantry_item)
 
 router.post(
     "/bulk-add",
     response_model=PantryItemsBulkCreateResponse,
 )(add_multiple_pantry_items)
-router.post(
-    "/bulk_add",
-    response_model=PantryItemsBulkCreateResponse,
-    include_in_schema=False,
-)(add_multiple_pantry_items)
 
 router.get(
     "/household-items",
     response_model=list[PantryItem],
 )(get_all_pantry_items)
-router.get(
-    "/get_household_items",
-    response_model=list[PantryItem],
-    include_in_schema=False,
-)(get_all_pantry_items)
 
 router.get(
     "/my-items",
     response_model=list[PantryItem],
 )(get_my_pantry_items)
-router.get(
-    "/get_my_items",
-    response_model=list[PantryItem],
-    include_in_schema=False,
-)(get_my_pantry_items)
 
 router.put(
     "/update-item",
     response_model=PantryItemUpsertResponse,
 )(update_pantry_item)
-router.put(
-    "/update_item",
-    response_model=PantryItemUpsertResponse,
-    include_in_schema=False,
-)(update_pantry_item)
 
 router.delete(
     "/delete-item",
     response_model=PantryItemUpsertResponse,
 )(delete_pantry_item)
-router.delete(
-    "/delete_item",
-    response_model=PantryItemUpsertResponse,
-    include_in_schema=False,
-)(delete_pantry_item)
+
+# Legacy underscore paths, rewritten to the canonical routes by PathAliasMiddleware
+# instead of being registered as duplicate routes.
+LEGACY_PATH_ALIASES: dict[str, str] = {
+    "/pantry/add_item": "/pantry/add-item",
+    "/pantry/bulk_add": "/pantry/bulk-add",
+    "/pantry/get_household_items": "/pantry/household-items",
+    "/pantry/get_my_items": "/pantry/my-items",
+    "/pantry/update_item": "/pantry/update-item",
+    "/pantry/delete_item": "/pantry/delete-item",
+}
 
 __all__ = [
     "router",
+    "LEGACY_PATH_ALIASES",
     "add_single_pantry_item",
     "add_multiple_pantry_items",
     "get_all_pantry_items",
@@ -1,38 +1,151 @@
 from __future__ import annotations
 
+import hashlib
+import time
+from types import SimpleNamespace
+from typing import Any
+
 from fastapi import Depends, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
 from uuid import UUID
-from supabase import Client
-import anyio
+from supabase import AsyncClient
 
 try:
     from gotrue import User
 except ImportError:
-    from typing import Any
     User = Any  # type: ignore[misc, assignment]
 
+from app.core.cache import cached, get_cache
+from app.core.config import get_settings
 from app.core.exceptions import AppError
 from app.core.logging import get_logger
-from app.deps.supabase import get_supabase_client
+from app.deps.supabase import get_supabase_async_client
+from app.models.household import HouseholdResponse
 
 logger = get_logger(__name__)
 auth_scheme = HTTPBearer(auto_error=False)
 
+# Caches the user's household row (the ID dependency reads it from there).
+# Membership changes go through HouseholdService, which invalidates the entry in
+# this process only. The household ID scopes pantry reads, so the TTL is kept short:
+# a user who left through another worker keeps read access for at most this long.
+HOUSEHOLD_ID_CACHE_TTL_SECONDS = 30
+
+
+def household_id_cache_key(user_id: UUID) -> str:
+    return f"auth:household:{user_id}"
+
+
+def invalidate_household_id(user_id: UUID) -> None:
+    """Drop the cached household ID for a user after their membership changes."""
+    get_cache().delete(household_id_cache_key(user_id))
+
+
+# Supabase signs user access tokens with the project JWT secret and this audience.
+JWT_ALGORITHMS = ["HS256"]
+JWT_AUDIENCE = "authenticated"
+
+
+# Users returned by Supabase Auth, and locally verified claims, are cached briefly,
+# keyed by a SHA-256 of the token so raw tokens are never held in memory. Kept well
+# under token lifetimes; the token's own exp is still checked on every request.
+USER_CACHE_TTL_SECONDS = 45
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def user_cache_key(token: str) -> str:
+    return f"auth:user:{_token_digest(token)}"
+
+
+def claims_cache_key(token: str) -> str:
+    return f"auth:claims:{_token_digest(token)}"
+
+
+@cached(
+    ttl_seconds=USER_CACHE_TTL_SECONDS,
+    key_func=lambda token, secret: claims_cache_key(token),
+)
+def _decode_token(token: str, secret: str) -> dict[str, Any]:
+    """
+    Verify a token's signature and audience, cached per token hash like Supabase Auth users.
+
+    Expiry is not checked here so a cached result never outlives the token;
+    callers compare ``exp`` against the clock on every request.
+    """
+    return jwt.decode(
+        token,
+        secret,
+        algorithms=JWT_ALGORITHMS,
+        audience=JWT_AUDIENCE,
+        options={"verify_exp": False, "require_exp": True},
+    )
+
+
+def _credentials_error(message: str) -> AppError:
+    return AppError(
+        message,
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _user_from_claims(claims: dict[str, Any]) -> SimpleNamespace:
+    """Build a lightweight stand-in for the Supabase User from verified token claims."""
+    return SimpleNamespace(
+        id=claims["sub"],
+        email=claims.get("email"),
+        role=claims.get("role"),
+        app_metadata=claims.get("app_metadata") or {},
+        user_metadata=claims.get("user_metadata") or {},
+    )
+
+
+def _token_expired(token: str) -> bool:
+    """Check the token's exp claim without verifying it; unreadable claims are left to Supabase Auth."""
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return False
+    return isinstance(exp, (int, float)) and exp <= time.time()
+
+
+@cached(
+    ttl_seconds=USER_CACHE_TTL_SECONDS,
+    key_func=lambda token, supabase: user_cache_key(token),
+)
+async def _fetch_user(token: str, supabase: AsyncClient) -> User:
+    """Validate a token with Supabase Auth; cached per token, with concurrent misses sharing one call."""
+    user_response = await supabase.auth.get_user(token)
+
+    if not user_response.user:
+        logger.error("Invalid authentication credentials (no user in response)")
+        raise _credentials_error("Invalid authentication credentials")
+
+    logger.info("User authenticated", extra={"user_id": str(user_response.user.id)})
+    return user_response.user
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(auth_scheme),
-    supabase: Client = Depends(get_supabase_client),
+    supabase: AsyncClient = Depends(get_supabase_async_client),
 ) -> User:
     """
     Dependency to get the current authenticated user from Supabase.
     
-    Validates the Bearer token and returns the user object.
+    Validates the Bearer token and returns the user object. When
+    SUPABASE_JWT_SECRET is set the token is verified locally and a lightweight
+    user built from its claims is returned; Supabase Auth is only called when
+    the secret is unset or local verification fails, and its result is cached
+    per token for USER_CACHE_TTL_SECONDS.
     Uses anon key client to respect Row Level Security policies.
     
     Args:
         credentials: HTTP Bearer token credentials from request header
-        supabase: Supabase client instance (injected via dependency)
+        supabase: Supabase async client instance (injected via dependency)
         
     Returns:
         Authenticated user object from Supabase (contains id, email, user_metadata, etc.)
@@ -42,38 +155,38 @@ async def get_current_user(
     """
     if not credentials:
         logger.error("Missing authentication credentials")
-        raise AppError(
-            "Missing authentication credentials",
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _credentials_error("Missing authentication credentials")
 
-    try:
-        user_response = await anyio.to_thread.run_sync(
-            lambda: supabase.auth.get_user(credentials.credentials)
-        )
-
-        if not user_response.user:
-            logger.error("Invalid authentication credentials (no user in response)")
-            raise AppError(
-                "Invalid authentication credentials",
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    token = credentials.credentials
+    jwt_secret = get_settings().supabase_jwt_secret
+    if jwt_secret:
+        try:
+            claims = _decode_token(token, jwt_secret)
+        except JWTError:
+            # e.g. a token signed with a rotated or asymmetric key; let Supabase Auth decide.
+            logger.debug("Local token verification failed; falling back to Supabase Auth")
+        else:
+            if claims["exp"] <= time.time():
+                logger.info("Authentication token expired")
+                raise _credentials_error("Could not validate credentials")
+            if claims.get("sub"):
+                logger.debug("User authenticated from token claims", extra={"user_id": str(claims["sub"])})
+                return _user_from_claims(claims)
 
-        logger.info("User authenticated", extra={"user_id": str(user_response.user.id)})
-        return user_response.user
+    # A cached user must not outlive its token.
+    if _token_expired(token):
+        logger.info("Authentication token expired")
+        raise _credentials_error("Could not validate credentials")
 
+    try:
+        return await _fetch_user(token, supabase)
     except AppError:
         raise
     except Exception as exc:
         logger.error("Could not validate credentials", exc_info=True)
-        raise AppError(
-            "Could not validate credentials",
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            headers={"WWW-Authenticate": "Bearer"},
-        ) from exc
-        
+        raise _credentials_error("Could not validate credentials") from exc
+
+
 async def get_current_user_id(
     user: User = Depends(get_current_user),
 ) -> UUID:
@@ -93,16 +206,80 @@ async def get_current_user_id(
     if not user_id:
         logger.error("Authenticated user missing user ID")
         raise AppError("Authenticated user missing user ID", status_code=status.HTTP_401_UNAUTHORIZED)
+    if isinstance(user_id, UUID):
+        return user_id
     try:
-        uuid_obj = UUID(str(user_id))
-    except Exception:
+        # Supabase user IDs are strings; only fall back to str() for anything else.
+        return UUID(user_id if isinstance(user_id, str) else str(user_id))
+    except (TypeError, ValueError):
         logger.error("Authenticated user has invalid user ID", extra={"user_id": str(user_id)})
         raise AppError("Authenticated user has invalid user ID", status_code=status.HTTP_401_UNAUTHORIZED)
-    return uuid_obj
+
+@cached(
+    ttl_seconds=HOUSEHOLD_ID_CACHE_TTL_SECONDS,
+    key_func=lambda user_id, supabase: household_id_cache_key(user_id),
+)
+async def _load_current_household(user_id: UUID, supabase: AsyncClient) -> HouseholdResponse:
+    """
+    Look up the user's household membership together with the household row.
+
+    The households row is embedded in the same PostgREST call, so endpoints that
+    need the household itself don't issue a second query. Cached per user;
+    concurrent misses for the same user share one in-flight query.
+    """
+    try:
+        response = await (
+            supabase.table("household_members")
+            .select("households!inner(id, name, invite_code, is_personal, created_at)")
+            .eq("user_id", str(user_id))
+            .maybe_single()
+            .execute()
+        )
+    except Exception as exc:
+        logger.error("Failed to resolve household membership", extra={"user_id": str(user_id)}, exc_info=True)
+        raise AppError(
+            "Failed to resolve household membership",
+            status_code=status.HTTP_502_BAD_GATEWAY,
+        ) from exc
+
+    # user_id is unique in household_members; maybe_single() returns None when there is no row.
+    if response is None or not response.data:
+        logger.error("User is not a member of any household", extra={"user_id": str(user_id)})
+        raise AppError("User is not a member of any household", status_code=status.HTTP_401_UNAUTHORIZED)
+
+    household = HouseholdResponse.from_db(response.data["households"])
+    logger.info("Resolved household for user", extra={"user_id": str(user_id), "household_id": str(household.id)})
+    return household
+
+
+async def get_current_household(
+    user_id: UUID = Depends(get_current_user_id),
+    supabase: AsyncClient = Depends(get_supabase_async_client),
+) -> HouseholdResponse:
+    """
+    Dependency to get the current authenticated user's household.
+
+    Args:
+        user_id: The UUID for the authenticated user.
+        supabase: The Supabase async client instance.
+
+    Returns:
+        The user's household, resolved with a single joined query and cached per user.
+
+    Raises:
+        AppError: If the user's ID is missing or the user is not in a household.
+    """
+    # Guard against missing user id from Supabase
+    if not user_id:
+        logger.error("get_current_household: missing user_id")
+        raise AppError("Authenticated user missing user ID", status_code=status.HTTP_401_UNAUTHORIZED)
+
+    return await _load_current_household(user_id, supabase)
+
 
 async def get_current_household_id(
     user_id: UUID = Depends(get_current_user_id),
-    supabase: Client = Depends(get_supabase_client),
+    supabase: AsyncClient = Depends(get_supabase_async_client),
 ) -> UUID:
     """
     Dependency to get the current authenticated user's primary household ID.
@@ -110,7 +287,7 @@ async def get_current_household_id(
 
     Args:
         user_id: The UUID for the authenticated user.
-        supabase: The Supabase client instance.
+        supabase: The Supabase async client instance.
 
     Returns:
         The UUID for the authenticated user's primary household.
@@ -123,29 +300,5 @@ async def get_current_household_id(
         logger.error("get_current_household_id: missing user_id")
         raise AppError("Authenticated user missing user ID", status_code=status.HTTP_401_UNAUTHORIZED)
 
-    try:
-        response = await anyio.to_thread.run_sync(
-            lambda: (
-                supabase.table("household_members")
-                .select("household_id")
-                .eq("user_id", str(user_id))
-                .limit(1)
-                .execute()
-            )
-        )
-    except Exception as exc:
-        logger.error("Failed to resolve household membership", extra={"user_id": str(user_id)}, exc_info=True)
-        raise AppError(
-            "Failed to resolve household membership",
-            status_code=status.HTTP_502_BAD_GATEWAY,
-        ) from exc
-
-    if not getattr(response, "data", None):
-        logger.error("User is not a member of any household", extra={"user_id": str(user_id)})
-        raise AppError("User is not a member of any household", status_code=status.HTTP_401_UNAUTHORIZED)
-
-    household_id = UUID(response.data[0]["household_id"])
-    logger.info("Resolved household for user", extra={"user_id": str(user_id), "household_id": str(household_id)})
-    return household_id
-
-
+    household = await _load_current_household(user_id, supabase)
+    return household.id
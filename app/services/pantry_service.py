@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
 import anyio
 from fastapi import status
+from postgrest.types import ReturnMethod
 from supabase import Client
 
 from app.core.exceptions import AppError
@@ -21,12 +21,15 @@ from app.models.pantry import (
     PantryItemsBulkCreateResponse,
     BulkUpsertResult,
 )
-from app.utils.date_time_styling import format_iso_date, format_iso_datetime
+from app.utils.date_time_styling import format_iso_date, iso_now
 from app.utils.embedding import embeddings_client
 
 logger = get_logger(__name__)
 _retriever_cache = get_retriever_cache()
 
+# Rows fetched per round-trip when streaming pantry listings.
+PANTRY_PAGE_SIZE = 100
+
 
 async def _ensure_user_in_household(
     supabase: Client, user_id: UUID, household_id: UUID, operation: str
@@ -113,8 +116,7 @@ class PantryService:
         data = pantry_item.model_dump()
         data["household_id"] = str(household_id)
         data["owner_id"] = str(user_id)
-        data["created_at"] = format_iso_datetime(value=datetime.now())
-        data["updated_at"] = format_iso_datetime(value=datetime.now())
+        data["created_at"] = data["updated_at"] = iso_now()
         data["expiry_date"] = (
             format_iso_date(value=data["expiry_date"]) if data["expiry_date"] else None
         )
@@ -149,6 +151,7 @@ class PantryService:
             # Pick the embedding for this one item, or None if failed
             embedding_vector = embeddings[0] if embeddings else None
             if embedding_vector is not None:
+                # Nothing is read back, so don't have PostgREST echo the vector.
                 await anyio.to_thread.run_sync(
                     lambda: (
                         self.supabase.table("pantry_embeddings")
@@ -158,8 +161,9 @@ class PantryService:
                                     "content": content,
                                     "metadata": metadata,
                                     "embedding": embedding_vector,
-                                    "created_at": format_iso_datetime(value=datetime.now()),
-                                }
+                                    "created_at": iso_now(),
+                                },
+                                returning=ReturnMethod.minimal,
                             )
                             .execute()
                     )
@@ -194,13 +198,13 @@ class PantryService:
             self.supabase, user_id, household_id, "Bulk add"
         )
 
+        now = iso_now()
         rows_to_upsert: List[Dict[str, object]] = []
         for item in pantry_items:
             data = item.model_dump()
             data["household_id"] = str(household_id)
             data["owner_id"] = str(user_id)
-            data["created_at"] = format_iso_datetime(value=datetime.now())
-            data["updated_at"] = format_iso_datetime(value=datetime.now())
+            data["created_at"] = data["updated_at"] = now
             data["expiry_date"] = format_iso_date(value=data["expiry_date"]) if data["expiry_date"] else None
             rows_to_upsert.append(data)
 
@@ -254,7 +258,7 @@ class PantryService:
                 await anyio.to_thread.run_sync(
                     lambda: (
                         self.supabase.table("pantry_embeddings")
-                            .upsert(embedding_rows)
+                            .upsert(embedding_rows, returning=ReturnMethod.minimal)
                             .execute()
                     )
                 )
@@ -344,8 +348,46 @@ class PantryService:
             logger.error("Failed to fetch household pantry items", exc_info=True, extra={"household_id": str(household_id)})
             raise AppError("Failed to fetch household pantry items", status_code=status.HTTP_502_BAD_GATEWAY) from exc
 
-        return response.data or []
+        rows = response.data or []
+        # The full listing doubles as a pantry fingerprint: drop RAG results only if items actually changed
+        # (e.g. writes made outside this service).
+        _retriever_cache.update_pantry_state(
+            str(household_id),
+            [(str(row.get("id")), str(row.get("updated_at"))) for row in rows],
+        )
+        return rows
     
+    async def iter_pantry_items(
+        self,
+        household_id: UUID,
+        user_id: Optional[UUID] = None,
+        page_size: int = PANTRY_PAGE_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield a household's pantry rows page by page, optionally only those owned by user_id.
+
+        Used by streaming list responses so the first rows can be sent before the
+        whole pantry has been fetched.
+        """
+        start = 0
+        while True:
+            query = self.supabase.table("pantry_items").select("*").eq("household_id", str(household_id))
+            if user_id is not None:
+                query = query.eq("owner_id", str(user_id))
+            end = start + page_size - 1
+            try:
+                response = await anyio.to_thread.run_sync(lambda: query.order("id").range(start, end).execute())
+            except Exception as exc:
+                logger.error("Failed to stream pantry items", exc_info=True, extra={"household_id": str(household_id), "offset": start})
+                raise AppError("Failed to fetch pantry items", status_code=status.HTTP_502_BAD_GATEWAY) from exc
+
+            rows = response.data or []
+            for row in rows:
+                yield row
+            if len(rows) < page_size:
+                return
+            start += page_size
+
     async def update_pantry_item(self, pantry_item: PantryItemUpsert, household_id: UUID, user_id: UUID) -> PantryItemUpsertResponse:
         """
         Update an existing pantry item for the given user and household.
@@ -362,7 +404,7 @@ class PantryService:
         try:
             # Issue an update, restricting by both household and owner id.
             data = pantry_item.model_dump()
-            data["updated_at"] = format_iso_datetime(value=datetime.now())
+            data["updated_at"] = iso_now()
             data["expiry_date"] = format_iso_date(value=data["expiry_date"]) if data["expiry_date"] else None
             response = await anyio.to_thread.run_sync(
                 lambda: (
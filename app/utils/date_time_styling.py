@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from datetime import date, datetime, timezone
 from typing import Literal
 
@@ -48,6 +49,64 @@ def format_iso_datetime(*, value: datetime, include_timezone: bool = False) -> s
     return value.strftime(ISO_DATETIME_FORMAT)
 
 
+# (epoch second, formatted value) for iso_now; the format has second precision.
+_iso_now_cache: tuple[int, str] = (-1, "")
+
+
+def iso_now() -> str:
+    """
+    Format the current local time like ``format_iso_datetime(value=datetime.now())``.
+    
+    The string only changes once per second, so it is formatted at most once per
+    second and reused for every call in between.
+    
+    Returns:
+        ISO formatted datetime string.
+    """
+    global _iso_now_cache
+    second = int(time.time())
+    cached_second, cached_value = _iso_now_cache
+    if second == cached_second:
+        return cached_value
+    value = datetime.fromtimestamp(second).strftime(ISO_DATETIME_FORMAT)
+    _iso_now_cache = (second, value)
+    return value
+
+
+def parse_iso_datetime(*, value: str | datetime) -> datetime:
+    """
+    Parse an ISO 8601 timestamp as returned by PostgREST (e.g. "2024-01-15T10:30:00.123+00:00" or "...Z").
+    
+    Args:
+        value: The timestamp string, or an already-parsed datetime (returned unchanged).
+        
+    Returns:
+        Parsed datetime.
+    """
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        raise TypeError(f"Expected str or datetime, got {type(value).__name__}")
+    return datetime.fromisoformat(value)
+
+
+def format_epoch_seconds(*, value: datetime) -> int:
+    """
+    Format a datetime as integer Unix epoch seconds.
+    
+    Args:
+        value: The datetime to format. Naive values are treated as UTC.
+        
+    Returns:
+        Seconds since 1970-01-01T00:00:00Z.
+    """
+    if not isinstance(value, datetime):
+        raise TypeError(f"Expected datetime, got {type(value).__name__}")
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
 def format_display_date(*, value: date, style: Literal["full", "short", "verbose"] = "full") -> str:
     """
     Format a date object for human-readable display.
@@ -253,6 +312,9 @@ def ensure_timezone_aware(*, value: datetime, default_tz: timezone = timezone.ut
 __all__ = [
     "format_iso_date",
     "format_iso_datetime",
+    "iso_now",
+    "parse_iso_datetime",
+    "format_epoch_seconds",
     "format_display_date",
     "format_time",
     "format_relative_time",
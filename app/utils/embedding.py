@@ -4,7 +4,7 @@ from functools import lru_cache
 
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
-from app.core.config import settings
+from app.core.config import get_settings
 
 
 @lru_cache(maxsize=1)
@@ -18,6 +18,7 @@ def embeddings_client() -> GoogleGenerativeAIEmbeddings:
     Returns:
         GoogleGenerativeAIEmbeddings: Configured embeddings client instance
     """
+    settings = get_settings()
     return GoogleGenerativeAIEmbeddings(
         model=settings.gemini_embeddings_model,
         api_key=settings.google_genai_api_key,
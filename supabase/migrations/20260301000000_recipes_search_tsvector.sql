@@ -0,0 +1,18 @@
+-- Full-text search vector for recipes, computed at write time.
+-- Search queries match `tsv @@ plainto_tsquery('english', :query)` against the GIN index
+-- instead of tokenizing title/description on every read.
+-- Guarded so the migration is a no-op until the recipes table exists.
+
+do $$
+begin
+  if to_regclass('public.recipes') is not null then
+    alter table public.recipes
+      add column if not exists tsv tsvector
+      generated always as (
+        to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))
+      ) stored;
+
+    create index if not exists recipes_tsv_idx on public.recipes using gin (tsv);
+  end if;
+end
+$$;
@@ -0,0 +1,6 @@
+-- Covering index for the per-request household lookup
+-- (`select household_id from household_members where user_id = :user_id`),
+-- so Postgres can answer it with an index-only scan instead of visiting the heap.
+
+create index if not exists idx_household_members_user_household
+  on public.household_members using btree (user_id) include (household_id) tablespace pg_default;
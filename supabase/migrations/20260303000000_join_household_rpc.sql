@@ -0,0 +1,66 @@
+-- join_household(p_user_id, p_invite_code): move a user into the household with the given invite code
+-- in one round-trip and one transaction. Moves the user's pantry items from their current household,
+-- switches their membership row, and returns the target household plus the number of items moved.
+-- Errors are raised with stable messages that HouseholdService maps to HTTP responses:
+--   household_not_found, personal_household, not_in_household.
+-- Called with the service role client only.
+
+create or replace function public.join_household(p_user_id uuid, p_invite_code text)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  v_target public.households%rowtype;
+  v_old_household_id uuid;
+  v_items_moved integer := 0;
+begin
+  select * into v_target
+  from public.households
+  where invite_code = p_invite_code
+  for share;
+
+  if not found then
+    raise exception 'household_not_found' using errcode = 'P0002';
+  end if;
+  if v_target.is_personal then
+    raise exception 'personal_household' using errcode = '22023';
+  end if;
+
+  -- Lock the membership row so concurrent joins/leaves for the same user serialize.
+  select household_id into v_old_household_id
+  from public.household_members
+  where user_id = p_user_id
+  for update;
+
+  if not found then
+    raise exception 'not_in_household' using errcode = 'P0002';
+  end if;
+
+  if v_old_household_id is distinct from v_target.id then
+    update public.pantry_items
+    set household_id = v_target.id, updated_at = now()
+    where household_id = v_old_household_id and owner_id = p_user_id;
+    get diagnostics v_items_moved = row_count;
+
+    update public.household_members
+    set household_id = v_target.id, joined_at = now()
+    where user_id = p_user_id;
+  end if;
+
+  return jsonb_build_object(
+    'household', jsonb_build_object(
+      'id', v_target.id,
+      'name', v_target.name,
+      'invite_code', v_target.invite_code,
+      'is_personal', v_target.is_personal,
+      'created_at', v_target.created_at
+    ),
+    'items_moved', v_items_moved
+  );
+end;
+$$;
+
+revoke all on function public.join_household(uuid, text) from public, anon, authenticated;
+grant execute on function public.join_household(uuid, text) to service_role;
@@ -0,0 +1,82 @@
+-- create_household_with_owner(p_user_id, p_name, p_invite_code, p_is_personal): create a household and
+-- its owner's membership in one round-trip and one transaction, so a failed membership insert never
+-- leaves an orphan household. Creating a personal household reuses the user's existing one.
+-- Personal households get their membership row from household_insert_member_trigger.
+-- Errors are raised with stable messages that HouseholdService maps to HTTP responses:
+--   already_member.
+-- Called with the service role client only.
+
+create or replace function public.create_household_with_owner(
+  p_user_id uuid,
+  p_name text,
+  p_invite_code text,
+  p_is_personal boolean default false
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  v_household public.households%rowtype;
+  v_constraint text;
+begin
+  perform 1
+  from public.household_members
+  where user_id = p_user_id
+  for update;
+
+  if found then
+    raise exception 'already_member' using errcode = '23505';
+  end if;
+
+  if p_is_personal then
+    select * into v_household
+    from public.households
+    where owner_id = p_user_id and is_personal
+    limit 1;
+  end if;
+
+  if v_household.id is null then
+    begin
+      insert into public.households (name, invite_code, is_personal, owner_id)
+      values (p_name, p_invite_code, p_is_personal, case when p_is_personal then p_user_id end)
+      returning * into v_household;
+
+      if not p_is_personal then
+        insert into public.household_members (household_id, user_id, joined_at)
+        values (v_household.id, p_user_id, now());
+      end if;
+    exception when unique_violation then
+      get stacked diagnostics v_constraint = constraint_name;
+      -- A concurrent request for the same user won the race.
+      if v_constraint = 'household_members_user_id_key' then
+        raise exception 'already_member' using errcode = '23505';
+      end if;
+      if not p_is_personal then
+        raise;
+      end if;
+
+      select * into v_household
+      from public.households
+      where owner_id = p_user_id and is_personal
+      limit 1;
+
+      if not found then
+        raise;
+      end if;
+    end;
+  end if;
+
+  return jsonb_build_object(
+    'id', v_household.id,
+    'name', v_household.name,
+    'invite_code', v_household.invite_code,
+    'is_personal', v_household.is_personal,
+    'created_at', v_household.created_at
+  );
+end;
+$$;
+
+revoke all on function public.create_household_with_owner(uuid, text, text, boolean) from public, anon, authenticated;
+grant execute on function public.create_household_with_owner(uuid, text, text, boolean) to service_role;
@@ -0,0 +1,61 @@
+-- create_personal_household(p_user_id, p_name, p_attempts): insert a personal household owned by the user
+-- with a fresh invite code in one round-trip. Candidate codes are generated here and deduplicated by
+-- the invite_code unique constraint (ON CONFLICT DO NOTHING), retrying up to p_attempts times.
+-- Returns the new household row, or raises invite_code_exhausted if every candidate collided.
+-- Codes grant access to a household, so they come from pgcrypto's gen_random_bytes, not random().
+-- Called with the service role client only.
+
+create extension if not exists pgcrypto with schema extensions;
+
+create or replace function public.create_personal_household(
+  p_user_id uuid,
+  p_name text,
+  p_attempts integer default 5
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  v_alphabet constant text := 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789';
+  v_household public.households%rowtype;
+  v_code text;
+  v_bytes bytea;
+  v_byte integer;
+begin
+  for attempt in 1..p_attempts loop
+    v_code := '';
+    while length(v_code) < 6 loop
+      v_bytes := extensions.gen_random_bytes(16);
+      for i in 0..15 loop
+        v_byte := get_byte(v_bytes, i);
+        -- 252 = 7 * 36: bytes above it are skipped so every character is equally likely.
+        if v_byte < 252 and length(v_code) < 6 then
+          v_code := v_code || substr(v_alphabet, 1 + v_byte % 36, 1);
+        end if;
+      end loop;
+    end loop;
+
+    insert into public.households (name, invite_code, is_personal, owner_id)
+    values (p_name, v_code, true, p_user_id)
+    on conflict (invite_code) do nothing
+    returning * into v_household;
+
+    if found then
+      return jsonb_build_object(
+        'id', v_household.id,
+        'name', v_household.name,
+        'invite_code', v_household.invite_code,
+        'is_personal', v_household.is_personal,
+        'created_at', v_household.created_at
+      );
+    end if;
+  end loop;
+
+  raise exception 'invite_code_exhausted' using errcode = '23505';
+end;
+$$;
+
+revoke all on function public.create_personal_household(uuid, text, integer) from public, anon, authenticated;
+grant execute on function public.create_personal_household(uuid, text, integer) to service_role;
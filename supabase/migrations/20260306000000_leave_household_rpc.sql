@@ -0,0 +1,66 @@
+-- leave_household(p_user_id, p_name, p_attempts): move a user out of their shared household into a new
+-- personal household in one round-trip and one transaction. Creates the personal household (via
+-- create_personal_household), moves the user's pantry items into it and switches their membership row,
+-- returning the new household id and name plus the number of items moved.
+-- Errors are raised with stable messages that HouseholdService maps to HTTP responses:
+--   not_in_household, personal_household, invite_code_exhausted.
+-- Called with the service role client only.
+
+create or replace function public.leave_household(
+  p_user_id uuid,
+  p_name text,
+  p_attempts integer default 5
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  v_old_household_id uuid;
+  v_is_personal boolean;
+  v_new_household jsonb;
+  v_new_household_id uuid;
+  v_items_moved integer := 0;
+begin
+  -- Lock the membership row so concurrent joins/leaves for the same user serialize.
+  select m.household_id, h.is_personal into v_old_household_id, v_is_personal
+  from public.household_members m
+  join public.households h on h.id = m.household_id
+  where m.user_id = p_user_id
+  for update of m;
+
+  if not found then
+    raise exception 'not_in_household' using errcode = 'P0002';
+  end if;
+  if v_is_personal then
+    raise exception 'personal_household' using errcode = '22023';
+  end if;
+
+  -- household_insert_member_trigger adds the owner as a member of a new personal household, so the
+  -- old membership row goes first; the upsert below covers databases without the trigger.
+  delete from public.household_members where user_id = p_user_id;
+
+  v_new_household := public.create_personal_household(p_user_id, p_name, p_attempts);
+  v_new_household_id := (v_new_household ->> 'id')::uuid;
+
+  insert into public.household_members (household_id, user_id, joined_at)
+  values (v_new_household_id, p_user_id, now())
+  on conflict (user_id) do update
+  set household_id = excluded.household_id, joined_at = excluded.joined_at;
+
+  update public.pantry_items
+  set household_id = v_new_household_id, updated_at = now()
+  where household_id = v_old_household_id and owner_id = p_user_id;
+  get diagnostics v_items_moved = row_count;
+
+  return jsonb_build_object(
+    'new_household_id', v_new_household_id,
+    'new_household_name', v_new_household ->> 'name',
+    'items_moved', v_items_moved
+  );
+end;
+$$;
+
+revoke all on function public.leave_household(uuid, text, integer) from public, anon, authenticated;
+grant execute on function public.leave_household(uuid, text, integer) to service_role;
@@ -0,0 +1,157 @@
+-- Generate household invite codes in the database: households.invite_code defaults to
+-- generate_invite_code(), so inserts no longer pass a code and the unique constraint
+-- households_invite_code_key catches the (rare) collisions. create_household_with_owner
+-- and create_personal_household use the default instead of codes supplied by the API.
+-- Codes grant access to a household, so they are drawn from pgcrypto's gen_random_bytes
+-- rather than random(), whose output is predictable.
+
+create extension if not exists pgcrypto with schema extensions;
+
+create or replace function public.generate_invite_code()
+returns text
+language plpgsql
+volatile
+as $$
+declare
+  v_alphabet constant text := 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789';
+  v_code text := '';
+  v_bytes bytea;
+  v_byte integer;
+begin
+  while length(v_code) < 6 loop
+    v_bytes := extensions.gen_random_bytes(16);
+    for i in 0..15 loop
+      v_byte := get_byte(v_bytes, i);
+      -- 252 = 7 * 36: bytes above it are skipped so every character is equally likely.
+      if v_byte < 252 and length(v_code) < 6 then
+        v_code := v_code || substr(v_alphabet, 1 + v_byte % 36, 1);
+      end if;
+    end loop;
+  end loop;
+  return v_code;
+end;
+$$;
+
+alter table public.households alter column invite_code set default public.generate_invite_code();
+
+-- p_invite_code is kept for compatibility; when null the column default generates the code,
+-- and a collision with an existing code is retried once with a fresh one.
+create or replace function public.create_household_with_owner(
+  p_user_id uuid,
+  p_name text,
+  p_invite_code text default null,
+  p_is_personal boolean default false
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  v_household public.households%rowtype;
+  v_constraint text;
+  v_attempt integer;
+begin
+  perform 1
+  from public.household_members
+  where user_id = p_user_id
+  for update;
+
+  if found then
+    raise exception 'already_member' using errcode = '23505';
+  end if;
+
+  if p_is_personal then
+    select * into v_household
+    from public.households
+    where owner_id = p_user_id and is_personal
+    limit 1;
+  end if;
+
+  if v_household.id is null then
+    for v_attempt in 1..2 loop
+      begin
+        insert into public.households (name, invite_code, is_personal, owner_id)
+        values (
+          p_name,
+          coalesce(p_invite_code, public.generate_invite_code()),
+          p_is_personal,
+          case when p_is_personal then p_user_id end
+        )
+        returning * into v_household;
+
+        if not p_is_personal then
+          insert into public.household_members (household_id, user_id, joined_at)
+          values (v_household.id, p_user_id, now());
+        end if;
+        exit;
+      exception when unique_violation then
+        get stacked diagnostics v_constraint = constraint_name;
+        -- A concurrent request for the same user won the race.
+        if v_constraint = 'household_members_user_id_key' then
+          raise exception 'already_member' using errcode = '23505';
+        end if;
+        -- The generated code is already taken: draw another one.
+        if v_constraint = 'households_invite_code_key' and p_invite_code is null and v_attempt = 1 then
+          continue;
+        end if;
+        if not p_is_personal then
+          raise;
+        end if;
+
+        select * into v_household
+        from public.households
+        where owner_id = p_user_id and is_personal
+        limit 1;
+
+        if not found then
+          raise;
+        end if;
+        exit;
+      end;
+    end loop;
+  end if;
+
+  return jsonb_build_object(
+    'id', v_household.id,
+    'name', v_household.name,
+    'invite_code', v_household.invite_code,
+    'is_personal', v_household.is_personal,
+    'created_at', v_household.created_at
+  );
+end;
+$$;
+
+create or replace function public.create_personal_household(
+  p_user_id uuid,
+  p_name text,
+  p_attempts integer default 5
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  v_household public.households%rowtype;
+begin
+  for attempt in 1..p_attempts loop
+    insert into public.households (name, is_personal, owner_id)
+    values (p_name, true, p_user_id)
+    on conflict (invite_code) do nothing
+    returning * into v_household;
+
+    if found then
+      return jsonb_build_object(
+        'id', v_household.id,
+        'name', v_household.name,
+        'invite_code', v_household.invite_code,
+        'is_personal', v_household.is_personal,
+        'created_at', v_household.created_at
+      );
+    end if;
+  end loop;
+
+  raise exception 'invite_code_exhausted' using errcode = '23505';
+end;
+$$;
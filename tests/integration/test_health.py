@@ -1,6 +1,7 @@
 """Integration tests for health and root endpoints."""
 from __future__ import annotations
 
+import pytest
 from fastapi import status
 
 
@@ -39,3 +40,26 @@ def test_health_endpoint_is_rate_limited(client) -> None:
     assert first.status_code == status.HTTP_200_OK
     assert second.status_code == status.HTTP_200_OK
     assert third.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_responses_carry_observability_headers(client) -> None:
+    response = client.get("/health")
+    assert response.headers["x-app-name"] == "pantry-server-test"
+    assert len(response.headers["x-trace-id"]) == 36
+    assert float(response.headers["x-response-time-ms"]) >= 0.0
+
+
+def test_fixed_window_limiter_returns_429(client, monkeypatch: pytest.MonkeyPatch) -> None:
+    fast_limiter = getattr(client.app.state, "rate_limiter", None)
+    if fast_limiter is None:
+        pytest.skip("Rate limiting disabled or using the SlowAPI backend")
+
+    # Lower the limit with fresh counters for this test only; both are restored afterwards.
+    monkeypatch.setattr(fast_limiter, "_counts", {})
+    monkeypatch.setattr(fast_limiter, "max_requests", 2)
+
+    assert client.get("/health").status_code == status.HTTP_200_OK
+    assert client.get("/health").status_code == status.HTTP_200_OK
+    third = client.get("/health")
+    assert third.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(third.headers["retry-after"]) > 0
@@ -3,12 +3,12 @@ from __future__ import annotations
 from types import SimpleNamespace
 from uuid import uuid4
 
-import anyio
 import pytest
 
+from app.core.cache import get_cache
 from app.core.exceptions import AppError
 from app.services import auth as auth_module
-from app.services.auth import get_current_household_id, get_current_user_id
+from app.services.auth import get_current_household, get_current_household_id, get_current_user_id
 
 
 class _FakeUser:
@@ -16,6 +16,16 @@ class _FakeUser:
         self.id = user_id
 
 
+def _household_row(household_id: object) -> dict[str, object]:
+    return {
+        "id": str(household_id),
+        "name": "Home",
+        "invite_code": "ABC123",
+        "is_personal": False,
+        "created_at": "2026-01-01T00:00:00+00:00",
+    }
+
+
 @pytest.mark.anyio
 async def test_get_current_user_id_happy_path() -> None:
     user_id = uuid4()
@@ -26,6 +36,15 @@ async def test_get_current_user_id_happy_path() -> None:
     assert result == user_id
 
 
+@pytest.mark.anyio
+async def test_get_current_user_id_accepts_string_id() -> None:
+    user_id = uuid4()
+
+    result = await get_current_user_id(user=_FakeUser(str(user_id)))
+
+    assert result == user_id
+
+
 @pytest.mark.anyio
 async def test_get_current_user_id_missing_id_raises_app_error() -> None:
     user = _FakeUser(None)
@@ -47,7 +66,7 @@ async def test_get_current_user_id_invalid_uuid_raises_app_error() -> None:
 
 
 @pytest.mark.anyio
-async def test_get_current_household_id_happy_path(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_get_current_household_id_happy_path() -> None:
     user_id = uuid4()
     household_id = uuid4()
 
@@ -58,30 +77,58 @@ async def test_get_current_household_id_happy_path(monkeypatch: pytest.MonkeyPat
         def eq(self, *_: str, **__: object) -> "_FakeTable":
             return self
 
-        def limit(self, *_: int, **__: object) -> "_FakeTable":
+        def maybe_single(self) -> "_FakeTable":
             return self
 
-        def execute(self):
-            return SimpleNamespace(data=[{"household_id": str(household_id)}])
+        async def execute(self):
+            return SimpleNamespace(data={"households": _household_row(household_id)})
 
     class _FakeSupabase:
         def table(self, name: str) -> _FakeTable:  # noqa: ARG002
             return _FakeTable()
 
-    def _run_sync(fn, *args, **kwargs):
-        return fn(*args, **kwargs)
-
-    monkeypatch.setattr(anyio.to_thread, "run_sync", _run_sync)
-
     result = await get_current_household_id(user_id=user_id, supabase=_FakeSupabase())
 
     assert result == household_id
+    auth_module.invalidate_household_id(user_id)
+
+
+@pytest.mark.anyio
+async def test_get_current_household_joins_household_row() -> None:
+    user_id = uuid4()
+    household_id = uuid4()
+    selects: list[str] = []
+
+    class _FakeTable:
+        def select(self, columns: str, **__: object) -> "_FakeTable":
+            selects.append(columns)
+            return self
+
+        def eq(self, *_: str, **__: object) -> "_FakeTable":
+            return self
+
+        def maybe_single(self) -> "_FakeTable":
+            return self
+
+        async def execute(self):
+            return SimpleNamespace(data={"households": _household_row(household_id)})
+
+    class _FakeSupabase:
+        def table(self, name: str) -> _FakeTable:  # noqa: ARG002
+            return _FakeTable()
+
+    household = await get_current_household(user_id=user_id, supabase=_FakeSupabase())
+    household_id_result = await get_current_household_id(user_id=user_id, supabase=_FakeSupabase())
+
+    assert household.id == household_id_result == household_id
+    assert household.invite_code == "ABC123"
+    # One joined query serves both dependencies.
+    assert selects == ["households!inner(id, name, invite_code, is_personal, created_at)"]
+    auth_module.invalidate_household_id(user_id)
 
 
 @pytest.mark.anyio
-async def test_get_current_household_id_no_membership_raises_app_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
+async def test_get_current_household_id_no_membership_raises_app_error() -> None:
     user_id = uuid4()
 
     class _EmptyTable:
@@ -91,23 +138,222 @@ async def test_get_current_household_id_no_membership_raises_app_error(
         def eq(self, *_: str, **__: object) -> "_EmptyTable":
             return self
 
-        def limit(self, *_: int, **__: object) -> "_EmptyTable":
+        def maybe_single(self) -> "_EmptyTable":
             return self
 
-        def execute(self):
-            return SimpleNamespace(data=[])
+        async def execute(self):
+            return None
 
     class _FakeSupabase:
         def table(self, name: str) -> _EmptyTable:  # noqa: ARG002
             return _EmptyTable()
 
-    def _run_sync(fn, *args, **kwargs):
-        return fn(*args, **kwargs)
-
-    monkeypatch.setattr(anyio.to_thread, "run_sync", _run_sync)
-
     with pytest.raises(AppError) as exc_info:
         await get_current_household_id(user_id=user_id, supabase=_FakeSupabase())
 
     assert "not a member of any household" in str(exc_info.value)
 
+
+
+@pytest.mark.anyio
+async def test_get_current_household_id_is_cached_until_invalidated() -> None:
+    user_id = uuid4()
+    household_id = uuid4()
+    calls: list[int] = []
+
+    class _FakeTable:
+        def select(self, *_: str, **__: object) -> "_FakeTable":
+            return self
+
+        def eq(self, *_: str, **__: object) -> "_FakeTable":
+            return self
+
+        def maybe_single(self) -> "_FakeTable":
+            return self
+
+        async def execute(self):
+            calls.append(1)
+            return SimpleNamespace(data={"households": _household_row(household_id)})
+
+    class _FakeSupabase:
+        def table(self, name: str) -> _FakeTable:  # noqa: ARG002
+            return _FakeTable()
+
+    first = await get_current_household_id(user_id=user_id, supabase=_FakeSupabase())
+    second = await get_current_household_id(user_id=user_id, supabase=_FakeSupabase())
+    assert first == second == household_id
+    assert len(calls) == 1
+
+    auth_module.invalidate_household_id(user_id)
+    await get_current_household_id(user_id=user_id, supabase=_FakeSupabase())
+    assert len(calls) == 2
+
+
+def _bearer(token: str) -> SimpleNamespace:
+    return SimpleNamespace(credentials=token)
+
+
+class _NoAuthSupabase:
+    class auth:  # noqa: N801
+        @staticmethod
+        def get_user(token: str) -> None:  # noqa: ARG004
+            raise AssertionError("Supabase Auth should not be called")
+
+
+@pytest.fixture
+def jwt_secret(monkeypatch: pytest.MonkeyPatch):
+    from app.core.config import get_settings
+
+    monkeypatch.setenv("SUPABASE_JWT_SECRET", "test-secret")
+    get_settings.cache_clear()
+    yield "test-secret"
+    get_settings.cache_clear()
+
+
+@pytest.mark.anyio
+async def test_get_current_user_verifies_token_locally(jwt_secret: str) -> None:
+    from jose import jwt
+
+    user_id = uuid4()
+    token = jwt.encode(
+        {"sub": str(user_id), "aud": "authenticated", "email": "a@example.com", "exp": 4_102_444_800},
+        jwt_secret,
+        algorithm="HS256",
+    )
+
+    user = await auth_module.get_current_user(credentials=_bearer(token), supabase=_NoAuthSupabase())
+
+    assert user.id == str(user_id)
+    assert user.email == "a@example.com"
+    assert await get_current_user_id(user=user) == user_id
+
+
+@pytest.mark.anyio
+async def test_get_current_user_expired_token_raises_without_fallback(jwt_secret: str) -> None:
+    from jose import jwt
+
+    token = jwt.encode({"sub": str(uuid4()), "aud": "authenticated", "exp": 1}, jwt_secret, algorithm="HS256")
+
+    with pytest.raises(AppError) as exc_info:
+        await auth_module.get_current_user(credentials=_bearer(token), supabase=_NoAuthSupabase())
+
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_get_current_user_memoizes_token_decoding(jwt_secret: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    from jose import jwt
+
+    token = jwt.encode(
+        {"sub": str(uuid4()), "aud": "authenticated", "exp": 4_102_444_800},
+        jwt_secret,
+        algorithm="HS256",
+    )
+    decodes = 0
+    decode = jwt.decode
+
+    def _counting_decode(*args, **kwargs):
+        nonlocal decodes
+        decodes += 1
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_module.jwt, "decode", _counting_decode)
+    get_cache().clear()
+
+    for _ in range(3):
+        await auth_module.get_current_user(credentials=_bearer(token), supabase=_NoAuthSupabase())
+
+    assert decodes == 1
+    # Claims are cached under the token's hash, never the raw token.
+    assert get_cache().get(auth_module.claims_cache_key(token))["sub"] is not None
+    assert all(token not in key for key in get_cache()._cache)
+    get_cache().clear()
+
+
+@pytest.mark.anyio
+async def test_get_current_user_caches_supabase_auth_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    from jose import jwt
+
+    from app.core.config import get_settings
+
+    monkeypatch.setenv("SUPABASE_JWT_SECRET", "")
+    get_settings.cache_clear()
+    user_id = uuid4()
+    token = jwt.encode({"sub": str(user_id), "exp": 4_102_444_800}, "other-secret", algorithm="HS256")
+    calls: list[str] = []
+
+    class _AuthSupabase:
+        class auth:  # noqa: N801
+            @staticmethod
+            async def get_user(token: str) -> SimpleNamespace:
+                calls.append(token)
+                return SimpleNamespace(user=_FakeUser(str(user_id)))
+
+    try:
+        first = await auth_module.get_current_user(credentials=_bearer(token), supabase=_AuthSupabase())
+        second = await auth_module.get_current_user(credentials=_bearer(token), supabase=_AuthSupabase())
+    finally:
+        auth_module.get_cache().delete(auth_module.user_cache_key(token))
+        get_settings.cache_clear()
+
+    assert first is second
+    assert calls == [token]
+
+
+@pytest.mark.anyio
+async def test_get_current_user_rejects_expired_token_before_supabase_auth(monkeypatch: pytest.MonkeyPatch) -> None:
+    from jose import jwt
+
+    from app.core.config import get_settings
+
+    monkeypatch.setenv("SUPABASE_JWT_SECRET", "")
+    get_settings.cache_clear()
+    token = jwt.encode({"sub": str(uuid4()), "exp": 1}, "other-secret", algorithm="HS256")
+
+    try:
+        with pytest.raises(AppError) as exc_info:
+            await auth_module.get_current_user(credentials=_bearer(token), supabase=_NoAuthSupabase())
+    finally:
+        get_settings.cache_clear()
+
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_get_current_household_id_coalesces_concurrent_misses() -> None:
+    import asyncio
+
+    user_id = uuid4()
+    household_id = uuid4()
+    calls: list[int] = []
+    release = asyncio.Event()
+
+    class _FakeTable:
+        def select(self, *_: str, **__: object) -> "_FakeTable":
+            return self
+
+        def eq(self, *_: str, **__: object) -> "_FakeTable":
+            return self
+
+        def maybe_single(self) -> "_FakeTable":
+            return self
+
+        async def execute(self):
+            await release.wait()
+            calls.append(1)
+            return SimpleNamespace(data={"households": _household_row(household_id)})
+
+    class _FakeSupabase:
+        def table(self, name: str) -> _FakeTable:  # noqa: ARG002
+            return _FakeTable()
+
+    tasks = [
+        asyncio.create_task(get_current_household_id(user_id=user_id, supabase=_FakeSupabase()))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [household_id] * 5
+    assert len(calls) == 1
+    auth_module.invalidate_household_id(user_id)
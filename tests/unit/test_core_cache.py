@@ -0,0 +1,176 @@
+"""Unit tests for app.core.cache."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache, cached, get_cache
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> int:
+        return int(self.now * 1_000_000_000)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _FakeClock:
+    fake_clock = _FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic_ns", fake_clock)
+    return fake_clock
+
+
+def test_get_returns_value_before_expiry(clock: _FakeClock) -> None:
+    cache = TTLCache(default_ttl_seconds=10)
+    cache.set("a", 1)
+    clock.now += 5
+    assert cache.get("a") == 1
+
+
+def test_get_evicts_expired_entry(clock: _FakeClock) -> None:
+    cache = TTLCache(default_ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=100)
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.size() == 1
+
+
+def test_overwrite_extends_expiry(clock: _FakeClock) -> None:
+    cache = TTLCache(default_ttl_seconds=10)
+    cache.set("a", 1)
+    clock.now += 5
+    cache.set("a", 2)
+    clock.now += 6
+    assert cache.get("a") == 2
+
+
+def test_max_entries_evicts_least_recently_used(clock: _FakeClock) -> None:
+    cache = TTLCache(default_ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_delete_and_clear(clock: _FakeClock) -> None:
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    assert cache.get("a") is None
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_delete_many(clock: _FakeClock) -> None:
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    cache.delete_many(["a", "b", "missing"])
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_coalesces_concurrent_async_misses() -> None:
+    calls = 0
+    release = asyncio.Event()
+
+    @cached(ttl_seconds=60)
+    async def _load(value: int) -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return value * 2
+
+    get_cache().clear()
+    tasks = [asyncio.create_task(_load(21)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [42] * 5
+    assert calls == 1
+    get_cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_cached_waiters_survive_cancelled_loader() -> None:
+    calls = 0
+    release = asyncio.Event()
+
+    @cached(ttl_seconds=60)
+    async def _load(value: int) -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return value * 2
+
+    get_cache().clear()
+    loader = asyncio.create_task(_load(21))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_load(21))
+    await asyncio.sleep(0)
+    loader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await waiter == 42
+    assert loader.cancelled()
+    assert calls == 2
+    get_cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_cached_load_does_not_store_after_delete() -> None:
+    calls = 0
+    release = asyncio.Event()
+
+    @cached(ttl_seconds=60, key_func=lambda value: f"load:{value}")
+    async def _load(value: int) -> int:
+        nonlocal calls
+        calls += 1
+        generation = calls
+        await release.wait()
+        return value * generation
+
+    get_cache().clear()
+    stale = asyncio.create_task(_load(21))
+    await asyncio.sleep(0)
+    get_cache().delete("load:21")
+    fresh = asyncio.create_task(_load(21))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await stale == 21
+    assert await fresh == 42
+    assert get_cache().get("load:21") == 42
+    assert await _load(21) == 42
+    assert calls == 2
+    get_cache().clear()
+
+
+def test_cached_wraps_sync_function() -> None:
+    calls = 0
+
+    @cached(ttl_seconds=60)
+    def _load(value: int) -> int:
+        nonlocal calls
+        calls += 1
+        return value + 1
+
+    get_cache().clear()
+    assert _load(1) == 2
+    assert _load(1) == 2
+    assert calls == 1
+    assert not asyncio.iscoroutinefunction(_load)
+    get_cache().clear()
@@ -7,6 +7,7 @@ from app.core.config import (
     AppSettings,
     parse_int_or_none,
     parse_cors_origins,
+    parse_hot_queries,
     str_to_bool,
 )
 
@@ -59,3 +60,20 @@ def test_gemini_temperature_out_of_range_raises(monkeypatch: pytest.MonkeyPatch)
     monkeypatch.setenv("GEMINI_TEMPERATURE", "3.5")
     with pytest.raises(ValueError):
         AppSettings()  # type: ignore[call-arg]
+
+
+def test_settings_parse_env_strings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CORS_ORIGINS", "['http://a.com', 'http://b.com']")
+    monkeypatch.setenv("GEMINI_MAX_TOKENS", "None")
+    monkeypatch.setenv("RATE_LIMIT_ENABLED", "off")
+    monkeypatch.setenv("GOOGLE_GENERATIVE_AI_API_KEY", "key")
+    settings = AppSettings()  # type: ignore[call-arg]
+    assert settings.cors_origins == ["http://a.com", "http://b.com"]
+    assert settings.gemini_max_tokens is None
+    assert settings.rate_limit_enabled is False
+    assert settings.google_genai_api_key == "key"
+
+
+def test_parse_hot_queries_skips_malformed_entries() -> None:
+    entries = ["hh-1:rice dishes", "no-query:", "hh-2: milk "]
+    assert parse_hot_queries(entries, 5) == [("hh-1", "rice dishes", 5), ("hh-2", "milk", 5)]
@@ -4,6 +4,7 @@ from __future__ import annotations
 from fastapi import status
 
 import pytest
+from pydantic import BaseModel, field_validator
 
 from app.core.exceptions import AppError, app_error_handler
 
@@ -39,3 +40,107 @@ async def test_app_error_handler_returns_json_response() -> None:
     body = json.loads(response.body.decode())
     assert body["error"] == "Test error"
     assert body["status_code"] == 400
+
+
+def test_unhandled_exception_hides_message_outside_debug() -> None:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.core.exceptions import setup_exception_handlers
+
+    app = FastAPI()
+    setup_exception_handlers(app)
+
+    @app.get("/boom")
+    def boom() -> None:
+        raise RuntimeError("secret detail")
+
+    response = TestClient(app, raise_server_exceptions=False).get("/boom")
+    assert response.status_code == 500
+    assert response.json() == {
+        "error": "Internal server error",
+        "message": "An unexpected error occurred",
+    }
+
+
+class _RejectingPayload(BaseModel):
+    name: str
+
+    @field_validator("name")
+    @classmethod
+    def reject(cls, value: str) -> str:
+        raise ValueError("bad name")
+
+
+def test_validation_errors_with_exception_context_serialize() -> None:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.core.exceptions import setup_exception_handlers
+
+    app = FastAPI()
+    setup_exception_handlers(app)
+
+    @app.post("/items")
+    def create(payload: _RejectingPayload) -> None:
+        return None
+
+    response = TestClient(app).post("/items", json={"name": "x"})
+    assert response.status_code == 422
+    body = response.json()
+    assert body["error"] == "Validation error"
+    assert "bad name" in body["details"][0]["msg"]
+    assert body["details"][0]["ctx"]["error"] == "bad name"
+
+
+def test_default_http_error_bodies_are_cached() -> None:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.core import exceptions as exceptions_module
+    from app.core.exceptions import setup_exception_handlers
+
+    app = FastAPI()
+    setup_exception_handlers(app)
+    client = TestClient(app)
+
+    first = client.get("/missing")
+    second = client.get("/also-missing")
+    assert first.status_code == second.status_code == 404
+    assert first.json() == {"error": "Not Found", "status_code": 404}
+    assert exceptions_module._STATUS_BODY_CACHE[404] == second.content
+
+
+def test_orjson_default_handles_validation_error_values() -> None:
+    import enum
+
+    from app.core.exceptions import _orjson_default
+
+    class Color(enum.Enum):
+        RED = "red"
+
+    assert _orjson_default(b"\xffraw") == "�raw"
+    assert _orjson_default(Color.RED) == "red"
+    assert _orjson_default(ValueError("bad")) == "bad"
+
+
+@pytest.mark.asyncio
+async def test_unhandled_exception_factory_skips_str_outside_debug() -> None:
+    import json
+    from unittest.mock import MagicMock, patch
+
+    from app.core.exceptions import create_unhandled_exception_handler
+
+    class _ExpensiveError(Exception):
+        def __str__(self) -> str:
+            raise AssertionError("str() should not be called for the response")
+
+    handler = create_unhandled_exception_handler(app_env="production")
+    with patch("app.core.exceptions.logger"):
+        response = await handler(MagicMock(), _ExpensiveError())
+
+    assert response.status_code == 500
+    assert json.loads(response.body) == {
+        "error": "Internal server error",
+        "message": "An unexpected error occurred",
+    }
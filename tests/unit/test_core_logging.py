@@ -17,3 +17,53 @@ def test_configure_logging_uses_info_level_for_production() -> None:
         root_logger = logging.getLogger()
         assert root_logger.level == logging.INFO
 
+
+
+def test_orjson_formatter_emits_extra_fields() -> None:
+    import orjson
+
+    from app.core.logging import OrjsonFormatter
+
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+    record.trace_id = "abc"
+    payload = orjson.loads(OrjsonFormatter().format(record))
+    assert payload["msg"] == "hello world"
+    assert payload["lvl"] == "INFO"
+    assert payload["name"] == "app.test"
+    assert payload["trace_id"] == "abc"
+
+
+def test_cached_time_formatter_reuses_timestamp_within_a_second() -> None:
+    import time
+
+    from app.core.logging import CachedTimeFormatter
+
+    formatter = CachedTimeFormatter(fmt="%(asctime)s %(message)s")
+    first = logging.LogRecord("app.test", logging.INFO, __file__, 1, "a", (), None)
+    second = logging.LogRecord("app.test", logging.INFO, __file__, 1, "b", (), None)
+    first.created, second.created = 1_700_000_000.1, 1_700_000_000.9
+
+    expected = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(1_700_000_000))
+    assert formatter.format(first) == f"{expected} a"
+    assert formatter.formatTime(second) is formatter.formatTime(first)
+
+
+def test_configure_logging_is_a_no_op_for_the_same_environment() -> None:
+    from app.core.logging import reset_logging_for_tests
+
+    reset_logging_for_tests()
+    configure_logging(app_env="development")
+    handlers = list(logging.getLogger().handlers)
+    configure_logging(app_env="development")
+    assert logging.getLogger().handlers == handlers
+
+    configure_logging(app_env="production")
+    assert logging.getLogger().handlers != handlers
+    reset_logging_for_tests()
+
+
+def test_resolve_log_level_is_case_insensitive() -> None:
+    from app.core.logging import resolve_log_level
+
+    assert resolve_log_level("Production") == logging.INFO
+    assert resolve_log_level("staging") == logging.DEBUG
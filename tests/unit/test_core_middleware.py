@@ -0,0 +1,22 @@
+"""Unit tests for app.core.middleware."""
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.middleware import PathAliasMiddleware
+
+
+def test_path_alias_middleware_rewrites_legacy_paths() -> None:
+    app = FastAPI()
+    app.add_middleware(PathAliasMiddleware, aliases={"/items_old": "/items"})
+
+    @app.get("/items")
+    def items() -> dict[str, str]:
+        return {"route": "items"}
+
+    client = TestClient(app)
+
+    assert client.get("/items_old").json() == {"route": "items"}
+    assert client.get("/items").json() == {"route": "items"}
+    assert client.get("/other").status_code == 404
@@ -0,0 +1,32 @@
+"""Unit tests for app.core.rate_limit_fast."""
+from __future__ import annotations
+
+import pytest
+
+from app.core import rate_limit_fast
+from app.core.rate_limit_fast import FixedWindowLimiter
+
+
+def test_hit_allows_up_to_limit_per_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(rate_limit_fast.time, "time", lambda: 120.0)
+    limiter = FixedWindowLimiter(max_requests=2)
+
+    assert limiter.hit("1.1.1.1") is True
+    assert limiter.hit("1.1.1.1") is True
+    assert limiter.hit("1.1.1.1") is False
+    assert limiter.hit("2.2.2.2") is True
+
+
+def test_new_window_resets_count_and_purges_old_windows(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [120.0]
+    monkeypatch.setattr(rate_limit_fast.time, "time", lambda: now[0])
+    monkeypatch.setattr(rate_limit_fast, "MAX_TRACKED_KEYS", 2)
+    limiter = FixedWindowLimiter(max_requests=1)
+
+    assert limiter.hit("a") is True
+    assert limiter.hit("a") is False
+
+    now[0] = 180.0
+    assert limiter.hit("a") is True
+    limiter.hit("b")
+    assert all(window == 3 for _, window in limiter._counts)
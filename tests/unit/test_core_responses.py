@@ -0,0 +1,31 @@
+"""Unit tests for app.core.responses."""
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from uuid import uuid4
+
+from app.core.responses import model_response
+from app.models.household import HouseholdResponse
+
+
+def test_model_response_serializes_model_to_json_bytes() -> None:
+    household_id = uuid4()
+    model = HouseholdResponse(
+        id=household_id,
+        name="Home",
+        invite_code="ABC123",
+        created_at=datetime(2024, 1, 1, 12, 0, 0),
+    )
+
+    response = model_response(model, status_code=201)
+
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {
+        "name": "Home",
+        "id": str(household_id),
+        "invite_code": "ABC123",
+        "is_personal": False,
+        "created_at": "2024-01-01T12:00:00",
+    }
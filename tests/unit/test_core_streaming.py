@@ -0,0 +1,44 @@
+"""Unit tests for app.core.streaming."""
+from __future__ import annotations
+
+import orjson
+import pytest
+
+from app.core.streaming import stream_json_array, stream_json_envelope
+
+
+async def _rows(*rows: dict) -> object:
+    for row in rows:
+        yield row
+
+
+@pytest.mark.asyncio
+async def test_stream_json_array_produces_valid_json() -> None:
+    chunks = [chunk async for chunk in stream_json_array(_rows({"id": 1}, {"id": 2}))]
+    assert orjson.loads(b"".join(chunks)) == [{"id": 1}, {"id": 2}]
+
+
+@pytest.mark.asyncio
+async def test_stream_json_array_handles_empty_input() -> None:
+    chunks = [chunk async for chunk in stream_json_array(_rows())]
+    assert b"".join(chunks) == b"[]"
+
+
+@pytest.mark.asyncio
+async def test_stream_json_envelope_appends_tail_after_items() -> None:
+    produced = []
+
+    async def _recipes():
+        for title in ("Soup", "Salad"):
+            produced.append(title)
+            yield {"title": title}
+
+    chunks = [
+        chunk
+        async for chunk in stream_json_envelope("recipes", _recipes(), lambda: {"pantry_items_used": len(produced)})
+    ]
+
+    assert orjson.loads(b"".join(chunks)) == {
+        "recipes": [{"title": "Soup"}, {"title": "Salad"}],
+        "pantry_items_used": 2,
+    }
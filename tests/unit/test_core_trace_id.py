@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import re
+
+from app.core.trace_id import new_trace_id
+
+_TRACE_ID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+
+
+def test_new_trace_id_is_uuid_formatted_and_unique_across_pool_refills() -> None:
+    trace_ids = [new_trace_id() for _ in range(1000)]
+    assert all(_TRACE_ID.match(trace_id) for trace_id in trace_ids)
+    assert len(set(trace_ids)) == len(trace_ids)
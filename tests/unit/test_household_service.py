@@ -60,7 +60,7 @@ class _FakeSupabase:
 
 @pytest.fixture(autouse=True)
 def _patch_thread_run_sync(monkeypatch: pytest.MonkeyPatch) -> None:
-    def _run_sync(fn, *args, **kwargs):
+    async def _run_sync(fn, *args, **kwargs):
         return fn(*args, **kwargs)
 
     monkeypatch.setattr(anyio.to_thread, "run_sync", _run_sync)
@@ -68,30 +68,179 @@ def _patch_thread_run_sync(monkeypatch: pytest.MonkeyPatch) -> None:
 
 @pytest.mark.anyio
 async def test_create_household_rejects_when_user_already_member() -> None:
-    service = HouseholdService(supabase=_FakeSupabase(membership_rows=[{"id": "member-1"}]))
+    from postgrest.exceptions import APIError
+
+    service = HouseholdService(supabase=_FakeSupabase())
     household = HouseholdCreate(name="Test Household", is_personal=False)
 
     with pytest.raises(AppError) as exc_info:
         await service.create_household(
             household=household,
             user_id=uuid4(),
-            supabase_admin=None,
+            supabase_admin=_FakeRpcSupabase(APIError({"message": "already_member", "code": "23505"})),
         )
 
+    assert exc_info.value.status_code == 400
     assert "User is already a member of a household" in str(exc_info.value)
 
 
 @pytest.mark.anyio
 async def test_create_household_success_creates_row() -> None:
-    service = HouseholdService(supabase=_FakeSupabase(membership_rows=[]))
+    supabase = _FakeRpcSupabase(
+        {
+            "id": str(uuid4()),
+            "name": "Group Household",
+            "invite_code": "ABC123",
+            "is_personal": False,
+            "created_at": "2024-01-01T00:00:00Z",
+        }
+    )
+    service = HouseholdService(supabase=_FakeSupabase())
     household = HouseholdCreate(name="Group Household", is_personal=False)
     user_id = uuid4()
 
     result = await service.create_household(
         household=household,
         user_id=user_id,
-        supabase_admin=None,
+        supabase_admin=supabase,
     )
 
     assert result.id is not None
     assert result.name == "Group Household"
+    # Membership check, household insert and member insert happen in one call.
+    [(name, params)] = supabase.rpc_calls
+    assert name == "create_household_with_owner"
+    assert params["p_user_id"] == str(user_id)
+    assert params["p_is_personal"] is False
+
+
+class _FakeRpcSupabase(_FakeSupabase):
+    def __init__(self, result: object) -> None:
+        super().__init__()
+        self._result = result
+        self.rpc_calls: list[tuple[str, dict]] = []
+
+    def rpc(self, name: str, params: dict) -> SimpleNamespace:
+        self.rpc_calls.append((name, params))
+
+        def _execute() -> SimpleNamespace:
+            if isinstance(self._result, Exception):
+                raise self._result
+            return SimpleNamespace(data=self._result)
+
+        return SimpleNamespace(execute=_execute)
+
+
+@pytest.mark.anyio
+async def test_join_household_by_invite_uses_single_rpc() -> None:
+    household = {
+        "id": str(uuid4()),
+        "name": "Shared",
+        "invite_code": "ABC123",
+        "is_personal": False,
+        "created_at": "2024-01-01T00:00:00Z",
+    }
+    supabase = _FakeRpcSupabase({"household": household, "items_moved": 3})
+    service = HouseholdService(supabase=supabase, supabase_admin=supabase)
+    user_id = uuid4()
+
+    result = await service.join_household_by_invite(" abc123 ", user_id)
+
+    assert supabase.rpc_calls == [("join_household", {"p_user_id": str(user_id), "p_invite_code": "ABC123"})]
+    assert result.items_moved == 3
+    assert result.household.name == "Shared"
+
+
+@pytest.mark.anyio
+async def test_join_household_by_invite_maps_rpc_errors() -> None:
+    from postgrest.exceptions import APIError
+
+    supabase = _FakeRpcSupabase(APIError({"message": "household_not_found", "code": "P0002"}))
+    service = HouseholdService(supabase=supabase, supabase_admin=supabase)
+
+    with pytest.raises(AppError) as exc_info:
+        await service.join_household_by_invite("ABC123", uuid4())
+
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_convert_personal_to_joinable_reads_membership_and_household_once() -> None:
+    user_id = uuid4()
+    household_row = {
+        "id": str(uuid4()),
+        "name": "Mine",
+        "invite_code": "ABC123",
+        "is_personal": True,
+        "created_at": "2024-01-01T00:00:00Z",
+        "owner_id": str(user_id),
+    }
+    calls: list[tuple[str, str]] = []
+
+    class _Table:
+        def __init__(self, name: str) -> None:
+            self.name = name
+            self.op = "select"
+
+        def select(self, *_: str, **__: object) -> "_Table":
+            return self
+
+        def update(self, payload: dict) -> "_Table":
+            self.op = "update"
+            self.payload = payload
+            return self
+
+        def eq(self, *_: str, **__: object) -> "_Table":
+            return self
+
+        def limit(self, *_: int, **__: object) -> "_Table":
+            return self
+
+        def execute(self) -> SimpleNamespace:
+            calls.append((self.name, self.op))
+            if self.op == "update":
+                return SimpleNamespace(data=[{**household_row, **self.payload}])
+            return SimpleNamespace(data=[{"household_id": household_row["id"], "households": household_row}])
+
+    class _Supabase:
+        def table(self, name: str) -> _Table:
+            return _Table(name)
+
+    service = HouseholdService(supabase=_Supabase(), supabase_admin=_Supabase())
+
+    result = await service.convert_personal_to_joinable(user_id, name="Shared")
+
+    assert result.name == "Shared"
+    assert calls == [("household_members", "select"), ("households", "update")]
+
+
+@pytest.mark.anyio
+async def test_leave_household_uses_single_rpc() -> None:
+    new_household_id = uuid4()
+    supabase = _FakeRpcSupabase(
+        {"new_household_id": str(new_household_id), "new_household_name": "My Household", "items_moved": 2}
+    )
+    service = HouseholdService(supabase=supabase, supabase_admin=supabase)
+    user_id = uuid4()
+
+    result = await service.leave_household(user_id)
+
+    [(name, params)] = supabase.rpc_calls
+    assert name == "leave_household"
+    assert params["p_user_id"] == str(user_id)
+    assert result.new_household_id == new_household_id
+    assert result.items_deleted == 2
+
+
+@pytest.mark.anyio
+async def test_leave_household_maps_rpc_errors() -> None:
+    from postgrest.exceptions import APIError
+
+    supabase = _FakeRpcSupabase(APIError({"message": "personal_household", "code": "22023"}))
+    service = HouseholdService(supabase=supabase, supabase_admin=supabase)
+
+    with pytest.raises(AppError) as exc_info:
+        await service.leave_household(uuid4())
+
+    assert exc_info.value.status_code == 400
+    assert "Already in personal household" in str(exc_info.value)
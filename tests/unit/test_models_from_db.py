@@ -0,0 +1,147 @@
+"""Unit tests for the trusted-row `from_db` constructors on response models."""
+from __future__ import annotations
+
+import json
+import warnings
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.household import HouseholdResponse
+from app.models.recipe import PlainInstruction, RecipeCreate, RecipeIngredient, RecipeResponse, RecipeStep, parse_ingredients, parse_instructions
+from app.models.shopping_list import ShoppingListItemCreate, ShoppingListResponse
+
+
+def test_household_from_db_converts_row_types() -> None:
+    household_id = uuid4()
+    household = HouseholdResponse.from_db(
+        {
+            "id": str(household_id),
+            "name": "Home",
+            "invite_code": "ABC123",
+            "created_at": "2024-01-01T00:00:00Z",
+        }
+    )
+
+    assert household.id == household_id
+    assert household.is_personal is False
+    assert household.created_at == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        household.model_dump_json()
+
+
+def test_recipe_from_db_parses_ingredients() -> None:
+    recipe = RecipeResponse.from_db(
+        {
+            "id": str(uuid4()),
+            "title": "Soup",
+            "ingredients": [{"name": "Carrot", "quantity": "2"}],
+            "instructions": ["Boil"],
+            "prep_time": 5,
+            "cook_time": 20,
+            "servings": 2,
+            "created_at": "2024-01-01T00:00:00+00:00",
+        }
+    )
+
+    assert isinstance(recipe.id, UUID)
+    assert recipe.ingredients == [RecipeIngredient(name="carrot", quantity="2")]
+    assert recipe.total_time == 25
+    assert json.loads(recipe.model_dump_json())["total_time"] == 25
+
+
+def test_parse_ingredients_validates_list() -> None:
+    ingredients = parse_ingredients([{"name": " Onion ", "quantity": "1"}, {"name": "Salt", "quantity": "pinch"}])
+
+    assert [ingredient.name for ingredient in ingredients] == ["onion", "salt"]
+
+
+def test_name_validators_keep_normalized_values_and_fix_others() -> None:
+    assert RecipeIngredient(name="olive oil", quantity="1").name == "olive oil"
+    assert RecipeIngredient(name="  Olive Oil ", quantity="1").name == "olive oil"
+    assert ShoppingListItemCreate(name="Olive Oil").name == "Olive Oil"
+    assert ShoppingListItemCreate(name=" olive oil").name == "Olive Oil"
+
+
+def test_parse_instructions_dispatches_on_type_and_wraps_strings() -> None:
+    instructions = parse_instructions(
+        ["Chop the onions", {"type": "step", "step_number": 2, "instruction": "Simmer for ten minutes"}]
+    )
+
+    assert instructions == [
+        PlainInstruction(text="Chop the onions"),
+        RecipeStep(step_number=2, instruction="Simmer for ten minutes"),
+    ]
+
+
+def test_shopping_list_from_db_derives_item_counts() -> None:
+    shopping_list = ShoppingListResponse.from_db(
+        {
+            "id": str(uuid4()),
+            "user_id": str(uuid4()),
+            "generated_at": "2024-01-01T00:00:00+00:00",
+            "updated_at": "2024-01-01T00:00:00+00:00",
+            "items": [{"name": "Milk", "purchased": True}, {"name": "Eggs"}],
+        }
+    )
+
+    assert (shopping_list.total_items, shopping_list.purchased_items, shopping_list.pending_items) == (2, 1, 1)
+
+
+def test_response_models_are_frozen() -> None:
+    household = HouseholdResponse.from_db(
+        {"id": str(uuid4()), "name": "Home", "invite_code": "ABC123", "created_at": "2024-01-01T00:00:00Z"}
+    )
+
+    with pytest.raises(ValidationError):
+        household.name = "Other"
+    assert household.model_copy(update={"name": "Other"}).name == "Other"
+
+
+def test_ingredient_units_are_interned() -> None:
+    first, second = parse_ingredients(
+        [
+            {"name": "flour", "quantity": "2", "unit": "".join(["c", "ups"])},
+            {"name": "sugar", "quantity": "1", "unit": "".join(["cu", "ps"])},
+        ]
+    )
+
+    assert first.unit is second.unit
+
+
+def test_read_models_skip_input_constraints() -> None:
+    row = {
+        "id": str(uuid4()),
+        "title": "A" * 250,
+        "ingredients": [],
+        "instructions": [],
+        "prep_time": 5,
+        "cook_time": 5,
+        "servings": 2,
+        "created_at": "2024-01-01T00:00:00+00:00",
+    }
+
+    assert RecipeResponse.model_validate(row).title == "A" * 250
+    with pytest.raises(ValidationError):
+        RecipeCreate.model_validate(row)
+
+
+def test_shopping_list_json_uses_epoch_timestamps() -> None:
+    shopping_list = ShoppingListResponse.from_db(
+        {
+            "id": str(uuid4()),
+            "user_id": str(uuid4()),
+            "generated_at": "2024-01-01T00:00:00+00:00",
+            "updated_at": "2024-01-01T00:01:00Z",
+            "items": [{"name": "Milk", "purchased": True, "purchased_at": "2024-01-01T00:00:30+00:00"}],
+        }
+    )
+
+    data = json.loads(shopping_list.model_dump_json())
+
+    assert (data["generated_at"], data["updated_at"]) == (1704067200, 1704067260)
+    assert data["items"][0]["purchased_at"] == 1704067230
+    assert isinstance(shopping_list.model_dump()["generated_at"], datetime)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import orjson
+import pytest
+
+from app.core.cache import get_cache
+from app.models.pantry import PantryItem
+from app.routers.pantry import get_all_pantry_items, get_my_pantry_items
+
+
+def _item(household_id, name: str, owner_id=None) -> PantryItem:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return PantryItem(
+        id=uuid4(),
+        owner_id=owner_id or uuid4(),
+        household_id=household_id,
+        name=name,
+        category="Dairy",
+        quantity=1,
+        unit="L",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_all_pantry_items_caches_serialized_body() -> None:
+    household_id = uuid4()
+    item = _item(household_id, "Milk")
+    calls = 0
+
+    class _FakePantryService:
+        async def get_household_pantry_items(self, *_: object) -> list[PantryItem]:
+            nonlocal calls
+            calls += 1
+            return [item]
+
+    get_cache().clear()
+    first = await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    second = await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+
+    assert calls == 1
+    assert first.body == second.body
+    assert first.media_type == "application/json"
+    assert orjson.loads(second.body)[0]["name"] == "Milk"
+    get_cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_get_all_pantry_items_serves_stale_body_while_refreshing(monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    from app.routers import pantry as pantry_router
+
+    household_id = uuid4()
+    names = iter(["Milk", "Eggs"])
+    calls = 0
+
+    class _FakePantryService:
+        async def get_household_pantry_items(self, *_: object) -> list[PantryItem]:
+            nonlocal calls
+            calls += 1
+            return [_item(household_id, next(names))]
+
+    clock = [1000.0]
+    monkeypatch.setattr(pantry_router.time, "monotonic", lambda: clock[0])
+    get_cache().clear()
+
+    await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    clock[0] += pantry_router.PANTRY_CACHE_TTL_SECONDS + 1
+    stale = await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    assert orjson.loads(stale.body)[0]["name"] == "Milk"
+
+    await asyncio.gather(*pantry_router._refresh_tasks)
+    fresh = await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    assert orjson.loads(fresh.body)[0]["name"] == "Eggs"
+    assert calls == 2
+    get_cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_refresh_does_not_overwrite_snapshot_stored_after_invalidation(monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    from app.routers import pantry as pantry_router
+
+    household_id = uuid4()
+    release_refresh = asyncio.Event()
+    names = iter(["Milk", "Stale refresh", "Fresh"])
+
+    class _FakePantryService:
+        async def get_household_pantry_items(self, *_: object) -> list[PantryItem]:
+            name = next(names)
+            if name == "Stale refresh":
+                await release_refresh.wait()
+            return [_item(household_id, name)]
+
+    clock = [1000.0]
+    monkeypatch.setattr(pantry_router.time, "monotonic", lambda: clock[0])
+    get_cache().clear()
+
+    await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    clock[0] += pantry_router.PANTRY_CACHE_TTL_SECONDS + 1
+    await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    await asyncio.sleep(0)
+
+    # A write invalidates the key and a new request stores fresh rows while the refresh is in flight.
+    pantry_router._invalidate_after_mutation(household_id)
+    await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    release_refresh.set()
+    await asyncio.gather(*pantry_router._refresh_tasks)
+
+    latest = await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    assert orjson.loads(latest.body)[0]["name"] == "Fresh"
+    get_cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_get_all_pantry_items_returns_304_for_matching_etag() -> None:
+    household_id = uuid4()
+
+    class _FakePantryService:
+        async def get_household_pantry_items(self, *_: object) -> list[PantryItem]:
+            return [_item(household_id, "Milk")]
+
+    get_cache().clear()
+    first = await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    etag = first.headers["etag"]
+
+    cached = await get_all_pantry_items(stream=False, if_none_match=etag, household_id=household_id, pantry_service=_FakePantryService())
+    assert cached.status_code == 304
+    assert cached.body == b""
+    assert cached.headers["etag"] == etag
+
+    changed = await get_all_pantry_items(stream=False, if_none_match='"other"', household_id=household_id, pantry_service=_FakePantryService())
+    assert changed.status_code == 200
+    assert changed.body == first.body
+    get_cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_get_all_pantry_items_serializes_raw_rows_through_response_model() -> None:
+    household_id = uuid4()
+    row = _item(household_id, "Milk").model_dump(mode="json") | {"embedding": [0.1, 0.2]}
+
+    class _FakePantryService:
+        async def get_household_pantry_items(self, *_: object) -> list[dict]:
+            return [row]
+
+    get_cache().clear()
+    response = await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+
+    item = orjson.loads(response.body)[0]
+    assert item["name"] == "Milk"
+    assert "embedding" not in item
+    get_cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_get_all_pantry_items_stream_validates_rows() -> None:
+    household_id = uuid4()
+    row = _item(household_id, "Milk").model_dump(mode="json") | {"embedding": [0.1, 0.2]}
+
+    class _FakePantryService:
+        async def iter_pantry_items(self, *_: object):
+            yield row
+
+    response = await get_all_pantry_items(stream=True, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    body = b"".join([chunk async for chunk in response.body_iterator])
+
+    item = orjson.loads(body)[0]
+    assert item["name"] == "Milk"
+    assert "embedding" not in item
+
+
+@pytest.mark.asyncio
+async def test_get_my_pantry_items_filters_the_household_snapshot() -> None:
+    household_id = uuid4()
+    user_id = uuid4()
+    items = [_item(household_id, "Milk", user_id), _item(household_id, "Eggs")]
+    calls = 0
+
+    class _FakePantryService:
+        async def get_household_pantry_items(self, *_: object) -> list[PantryItem]:
+            nonlocal calls
+            calls += 1
+            return items
+
+    get_cache().clear()
+    household = await get_all_pantry_items(stream=False, if_none_match=None, household_id=household_id, pantry_service=_FakePantryService())
+    mine = await get_my_pantry_items(
+        stream=False, if_none_match=None, user_id=user_id, household_id=household_id, pantry_service=_FakePantryService()
+    )
+
+    assert calls == 1
+    assert len(orjson.loads(household.body)) == 2
+    assert [item["name"] for item in orjson.loads(mine.body)] == ["Milk"]
+    assert mine.headers["etag"] != household.headers["etag"]
+    get_cache().clear()
@@ -36,7 +36,7 @@ class _FakeTable:
         self._op = "delete"
         return self
 
-    def upsert(self, payload: object) -> "_FakeTable":
+    def upsert(self, payload: object, **__: object) -> "_FakeTable":
         self._op = "upsert"
         self._payload = payload
         return self
@@ -0,0 +1,182 @@
+"""Unit tests for app.ai.retriever_cache."""
+from __future__ import annotations
+
+import gc
+import importlib
+from uuid import UUID
+
+import pytest
+from langchain_core.documents import Document
+
+import app.deps.supabase as supabase_deps
+from app.ai.retriever_cache import RetrieverCache
+from app.ai.vector_store import get_vector_store
+from app.core.config import get_settings
+from app.utils.embedding import embeddings_client
+
+
+def _docs(*contents: str) -> list[Document]:
+    return [Document(page_content=content) for content in contents]
+
+
+@pytest.fixture
+def retriver(monkeypatch: pytest.MonkeyPatch):
+    """app.ai.retriver built against dummy settings, with a fresh cache and counted searches."""
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_ANON_KEY", "anon")
+    monkeypatch.setenv("GOOGLE_GENERATIVE_AI_API_KEY", "key")
+    monkeypatch.setattr(supabase_deps, "_client", None)
+    get_settings.cache_clear()
+    module = importlib.import_module("app.ai.retriver")
+
+    calls = {"searches": 0}
+
+    def _search(query_vector: list[float], k: int) -> list[Document]:
+        calls["searches"] += 1
+        return _docs("Rice")
+
+    monkeypatch.setattr(module, "_cache", RetrieverCache(ttl_seconds=60))
+    monkeypatch.setattr(module, "_embed_queries", lambda queries: [[1.0, 0.0, 0.0] for _ in queries])
+    monkeypatch.setattr(module, "_search", _search)
+    monkeypatch.setattr(module, "_fts_search", lambda query, k, household_key: [])
+    module.calls = calls
+    yield module
+
+    get_settings.cache_clear()
+    get_vector_store.cache_clear()
+    embeddings_client.cache_clear()
+
+
+def test_get_returns_cached_entry() -> None:
+    cache = RetrieverCache(ttl_seconds=60)
+    documents = cache.set("hh-1", "dairy", 5, _docs("Milk", "Eggs"), "Milk\n\nEggs")
+
+    assert cache.get("hh-1", "dairy", 5) == ("Milk\n\nEggs", documents)
+    assert cache.get("hh-1", "dairy", 3) is None
+    assert cache.get("hh-2", "dairy", 5) is None
+
+
+def test_invalidate_household_only_removes_that_household() -> None:
+    cache = RetrieverCache(ttl_seconds=60)
+    cache.set("hh-1", "dairy", 5, _docs("Milk"), "Milk")
+    cache.set("hh-1", "bread", 5, _docs("Bread"), "Bread")
+    cache.set("hh-2", "dairy", 5, _docs("Cheese"), "Cheese")
+
+    cache.invalidate_household("hh-1")
+
+    assert cache.get("hh-1", "dairy", 5) is None
+    assert cache.get("hh-1", "bread", 5) is None
+    assert cache.get("hh-2", "dairy", 5) is not None
+
+
+def test_expired_entry_is_dropped() -> None:
+    cache = RetrieverCache(ttl_seconds=-1)
+    cache.set("hh-1", "dairy", 5, _docs("Milk"), "Milk")
+
+    assert cache.get("hh-1", "dairy", 5) is None
+
+
+def test_get_similar_hits_on_close_query_embedding() -> None:
+    cache = RetrieverCache(ttl_seconds=60)
+    documents = cache.set("hh-1", "eggs", 5, _docs("Eggs"), "Eggs", query_vector=[1.0, 0.0, 0.0])
+
+    assert cache.get_similar("hh-1", [0.99, 0.05, 0.0], 5) == ("Eggs", documents)
+    assert cache.get_similar("hh-1", [0.0, 1.0, 0.0], 5) is None
+    assert cache.get_similar("hh-1", [1.0, 0.0, 0.0], 3) is None
+
+    cache.invalidate_household("hh-1")
+    assert cache.get_similar("hh-1", [1.0, 0.0, 0.0], 5) is None
+
+
+def test_recent_documents_stay_pinned() -> None:
+    cache = RetrieverCache(max_pinned=1)
+    cache.set("hh-1", "rice", 5, _docs("Rice"), "Rice")
+    gc.collect()
+
+    assert cache.get("hh-1", "rice", 5) == ("Rice", _docs("Rice"))
+
+    cache.set("hh-1", "beans", 5, _docs("Beans"), "Beans")
+    gc.collect()
+
+    assert cache.get("hh-1", "rice", 5) == ("Rice", [])
+    assert cache.get("hh-1", "beans", 5) == ("Beans", _docs("Beans"))
+
+
+def test_documents_are_dropped_once_unreferenced() -> None:
+    cache = RetrieverCache(max_pinned=0)
+    documents = cache.set("hh-1", "rice", 5, _docs("Rice"), "Rice")
+
+    assert cache.get("hh-1", "rice", 5)[1] is documents
+    del documents
+    gc.collect()
+
+    assert cache.get("hh-1", "rice", 5) == ("Rice", [])
+    assert cache.get_serialized("hh-1", "rice", 5) == "Rice"
+
+
+async def test_warmup_fills_cache_and_skips_failures() -> None:
+    cache = RetrieverCache(ttl_seconds=60)
+
+    def _loader(household_id: str, query: str, k: int) -> None:
+        if query == "broken":
+            raise RuntimeError("search failed")
+        cache.set(household_id, query, k, _docs(query), query)
+
+    await cache.warmup([("hh-1", "rice", 5), ("hh-1", "broken", 5), ("hh-2", "milk", 3)], _loader)
+
+    assert cache.get("hh-1", "rice", 5) == ("rice", _docs("rice"))
+    assert cache.get("hh-1", "broken", 5) is None
+    assert cache.get("hh-2", "milk", 3) == ("milk", _docs("milk"))
+
+
+async def test_warmed_queries_hit_in_the_retrieval_tool(retriver) -> None:
+    household_id = UUID("0b8f4a52-6a0e-4c1e-9d55-3f0e8a7c2b10")
+
+    await retriver.warmup_retriever_cache([(str(household_id).upper(), " rice ", 5)])
+    assert retriver.calls["searches"] == 1
+
+    result = retriver.retrieve_pantry_items.func(query="rice", k=5, household_id=household_id)
+
+    assert result == ("Rice", _docs("Rice"))
+    assert retriver.calls["searches"] == 1
+
+
+def test_update_pantry_state_only_invalidates_on_content_change() -> None:
+    cache = RetrieverCache(ttl_seconds=60)
+    stamps = [("item-2", "2026-01-02T00:00:00"), ("item-1", "2026-01-01T00:00:00")]
+    cache.set("hh-1", "dairy", 5, _docs("Milk"), "Milk")
+    # The first fingerprint is only recorded; warmed entries stay.
+    assert cache.update_pantry_state("hh-1", stamps) is False
+    assert cache.get("hh-1", "dairy", 5) is not None
+
+    assert cache.update_pantry_state("hh-1", list(reversed(stamps))) is False
+    assert cache.get("hh-1", "dairy", 5) is not None
+
+    assert cache.update_pantry_state("hh-1", [*stamps, ("item-3", "2026-01-03T00:00:00")]) is True
+    assert cache.get("hh-1", "dairy", 5) is None
+
+
+def test_concurrent_expiry_and_writes_do_not_raise() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = RetrieverCache(ttl_seconds=-1)
+    documents = _docs("Milk")
+
+    def _churn(worker: int) -> None:
+        for i in range(200):
+            cache.set("hh-1", f"q{i % 5}", 5, documents, "Milk", query_vector=[1.0, float(worker), 0.0])
+            cache.get("hh-1", f"q{i % 5}", 5)
+            cache.get_similar("hh-1", [1.0, 0.0, 0.0], 5)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_churn, range(8)))
+
+
+def test_retrieve_answers_from_context_once_documents_are_freed(retriver, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(retriver, "_cache", RetrieverCache(ttl_seconds=60, max_pinned=0))
+
+    assert retriver._retrieve("hh-1", ["rice"], 5) == ("Rice", _docs("Rice"))
+    gc.collect()
+
+    assert retriver._retrieve("hh-1", ["rice"], 5) == ("Rice", [])
+    assert retriver.calls["searches"] == 1
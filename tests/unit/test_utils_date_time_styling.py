@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from app.utils import date_time_styling
+from app.utils.date_time_styling import format_iso_datetime, iso_now
+
+
+def test_iso_now_matches_format_iso_datetime_and_is_reused_within_a_second(monkeypatch) -> None:
+    now = 1_767_225_600.25
+    monkeypatch.setattr(date_time_styling.time, "time", lambda: now)
+    monkeypatch.setattr(date_time_styling, "_iso_now_cache", (-1, ""))
+
+    first = iso_now()
+    now += 0.5
+    second = iso_now()
+    now += 1
+    third = iso_now()
+
+    assert first == format_iso_datetime(value=datetime.fromtimestamp(1_767_225_600))
+    assert second is first
+    assert third == format_iso_datetime(value=datetime.fromtimestamp(1_767_225_601))